@@ -10,9 +10,12 @@ __email__ = "contact@rskit.dev"
 
 # Import main classes for easy access
 from .models.query import Query, SpatialExtent, TemporalExtent
+from .core.executor import execute, execute_many
 
 __all__ = [
     "Query",
     "SpatialExtent", 
     "TemporalExtent",
+    "execute",
+    "execute_many",
 ]
@@ -1,5 +1,21 @@
 """
 Authentication and authorization modules for RS-Kit.
 
-This module will contain authentication handlers for various data sources.
+This module contains credential lookup (environment and ``.netrc``) and a
+shared cache of logged-in sessions and bearer tokens used by data source plugins.
 """
+
+from .credentials import Credentials, load_credentials
+from .manager import CredentialManager, SessionPool, get_credential_manager
+from .tokens import Token, TokenCache, fetch_token
+
+__all__ = [
+    "Credentials",
+    "CredentialManager",
+    "SessionPool",
+    "Token",
+    "TokenCache",
+    "fetch_token",
+    "get_credential_manager",
+    "load_credentials",
+]
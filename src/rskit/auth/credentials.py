@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import netrc
+import os
+from pathlib import Path
+from typing import Mapping, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Credentials(BaseModel):
+    """Username/password pair used to log in to a data portal."""
+    host: str = Field(..., description="Host the credentials belong to (e.g., 'ftp-access.aviso.altimetry.fr')")
+    username: str = Field(..., description="Login name")
+    password: str = Field(default="", repr=False, description="Password or API key")
+
+
+def _env_prefix(source: str) -> str:
+    """Build the environment variable prefix for a source name."""
+    cleaned = "".join(c if c.isalnum() else "_" for c in source.upper())
+    return f"RSKIT_{cleaned}_"
+
+
+def load_credentials(
+    host: str,
+    source: Optional[str] = None,
+    netrc_path: Optional[str | Path] = None,
+    env: Optional[Mapping[str, str]] = None,
+) -> Optional[Credentials]:
+    """
+    Resolve credentials for a host.
+
+    Environment variables take precedence over ``.netrc``:
+    ``RSKIT_<SOURCE>_USERNAME`` / ``RSKIT_<SOURCE>_PASSWORD`` when ``source``
+    is given, then the ``.netrc`` entry for ``host``. The ``.netrc`` location
+    defaults to ``$NETRC`` or ``~/.netrc``.
+
+    Returns None when no credentials are configured.
+    """
+    env = os.environ if env is None else env
+
+    if source is not None:
+        prefix = _env_prefix(source)
+        username = env.get(prefix + "USERNAME")
+        if username:
+            return Credentials(host=host, username=username, password=env.get(prefix + "PASSWORD", ""))
+
+    if netrc_path is None:
+        netrc_path = env.get("NETRC") or Path.home() / ".netrc"
+    path = Path(netrc_path)
+    if not path.is_file():
+        return None
+
+    try:
+        entry = netrc.netrc(str(path)).authenticators(host)
+    except netrc.NetrcParseError as e:
+        raise ValueError(f"Could not parse netrc file {path}: {e}") from e
+    if entry is None:
+        return None
+
+    login, _, password = entry
+    return Credentials(host=host, username=login or "", password=password or "")
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .credentials import Credentials, load_credentials
+from .tokens import Token, TokenCache, fetch_token
+
+S = TypeVar("S")
+
+
+class SessionPool:
+    """
+    Bounded pool of logged-in connections to one host.
+
+    Connections are checked out by one worker at a time and returned for
+    reuse, so non-thread-safe sessions such as ``ftplib.FTP`` can be shared
+    across scheduler workers without logging in per file.
+    """
+
+    def __init__(self, login: Callable[[], Any], max_size: int = 4):
+        if max_size < 1:
+            raise ValueError(f"max_size must be >= 1, got {max_size}")
+        self.login = login
+        self.max_size = max_size
+        self._idle: List[Any] = []
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Check out a connection, logging in only if no idle one is available.
+
+        A connection whose block raised is closed instead of being returned,
+        since it may be left in an unknown protocol state.
+        """
+        self._slots.acquire()
+        try:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                session = self.login()
+            try:
+                yield session
+            except BaseException:
+                _close(session)
+                raise
+            with self._lock:
+                if self._closed:
+                    _close(session)
+                else:
+                    self._idle.append(session)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close idle connections; connections in use are closed when returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            _close(session)
+
+
+class CredentialManager:
+    """
+    Shared store of credentials, logged-in sessions and bearer tokens.
+
+    Plugins ask the manager for a session or token instead of logging in
+    themselves, so one login per host is reused across files, sources and
+    pooled connections.
+    """
+
+    def __init__(
+        self,
+        netrc_path: Optional[str | Path] = None,
+        token_cache_dir: Optional[str | Path] = None,
+        refresh_margin: float = 60.0,
+        pool_size: int = 4,
+    ):
+        self.netrc_path = netrc_path
+        self.pool_size = pool_size
+        self.tokens = TokenCache(cache_dir=token_cache_dir, refresh_margin=refresh_margin)
+        self._credentials: Dict[Tuple[str, Optional[str]], Credentials] = {}
+        self._sessions: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._session_locks: Dict[Tuple[str, Optional[str]], threading.Lock] = {}
+        self._pools: Dict[Tuple[str, Optional[str]], SessionPool] = {}
+        self._lock = threading.Lock()
+
+    def credentials(self, host: str, source: Optional[str] = None) -> Optional[Credentials]:
+        """
+        Return credentials for ``host``, reading the environment and ``.netrc`` once.
+
+        Misses are not remembered, so credentials configured while the process
+        runs (e.g. a long-lived daemon) are picked up on the next call.
+        """
+        key = (host, source)
+        with self._lock:
+            creds = self._credentials.get(key)
+            if creds is None:
+                creds = load_credentials(host, source=source, netrc_path=self.netrc_path)
+                if creds is not None:
+                    self._credentials[key] = creds
+            return creds
+
+    def get_session(
+        self,
+        host: str,
+        login: Callable[[Optional[Credentials]], S],
+        source: Optional[str] = None,
+    ) -> S:
+        """
+        Return the cached session for ``host``, creating it with ``login`` on first use.
+
+        ``login`` receives the resolved credentials (or None) and must return a
+        thread-safe session, since the same object is handed to every caller.
+        Use :meth:`connection` for connections that must not be shared.
+        """
+        key = (host, source)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                return session
+            lock = self._session_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = login(self.credentials(host, source))
+                with self._lock:
+                    self._sessions[key] = session
+            return session
+
+    @contextmanager
+    def connection(
+        self,
+        host: str,
+        login: Callable[[Optional[Credentials]], S],
+        source: Optional[str] = None,
+    ) -> Iterator[S]:
+        """
+        Check out a pooled connection to ``host`` for exclusive use.
+
+        Up to ``pool_size`` connections per host are logged in with ``login``
+        and reused across calls, e.g. ``ftplib.FTP`` connections shared by
+        download workers.
+        """
+        key = (host, source)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = SessionPool(lambda: login(self.credentials(host, source)), self.pool_size)
+        with pool.connection() as session:
+            yield session
+
+    def drop_session(self, host: str, source: Optional[str] = None) -> None:
+        """Forget and close a session, e.g. after the server dropped the connection."""
+        with self._lock:
+            session = self._sessions.pop((host, source), None)
+        _close(session)
+
+    def get_token(self, host: str, token_url: str, source: Optional[str] = None) -> Token:
+        """Return a valid bearer token for ``host``, logging in at ``token_url`` if needed."""
+        def fetch() -> Token:
+            creds = self.credentials(host, source)
+            if creds is None:
+                raise ValueError(f"No credentials configured for host '{host}'")
+            return fetch_token(token_url, creds)
+
+        return self.tokens.get(f"{host}|{source or ''}|{token_url}", fetch)
+
+    def close(self) -> None:
+        """Close all cached sessions and pooled connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for session in sessions:
+            _close(session)
+        for pool in pools:
+            pool.close()
+
+
+def _close(session: Any) -> None:
+    for name in ("quit", "close"):
+        method = getattr(session, name, None)
+        if callable(method):
+            try:
+                method()
+            except Exception:
+                pass
+            return
+
+
+_default_manager: Optional[CredentialManager] = None
+_default_lock = threading.Lock()
+
+
+def get_credential_manager() -> CredentialManager:
+    """
+    Return the process-wide credential manager.
+
+    Tokens are persisted under ``$RSKIT_TOKEN_CACHE`` when set, so that
+    separate processes share logins.
+    """
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = CredentialManager(token_cache_dir=os.environ.get("RSKIT_TOKEN_CACHE"))
+        return _default_manager
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+from pydantic import BaseModel, Field
+
+from .credentials import Credentials
+
+try:  # process-level locking is POSIX only; fall back to thread locking elsewhere
+    import fcntl
+except ImportError:  # pragma: no cover - exercised on Windows only
+    fcntl = None
+
+
+class Token(BaseModel):
+    """Bearer token with an absolute expiry time."""
+    access_token: str = Field(..., repr=False, description="Opaque token value")
+    token_type: str = Field(default="Bearer", description="Authorization scheme")
+    expires_at: datetime = Field(..., description="UTC time after which the token is invalid")
+
+    def expires_within(self, seconds: float) -> bool:
+        """Return True if the token expires within ``seconds`` from now."""
+        return datetime.now(timezone.utc) + timedelta(seconds=seconds) >= self.expires_at
+
+    @property
+    def authorization_header(self) -> str:
+        """Value for the HTTP ``Authorization`` header."""
+        return f"{self.token_type} {self.access_token}"
+
+
+def fetch_token(url: str, credentials: Credentials, timeout: float = 30.0) -> Token:
+    """
+    Request a bearer token from an OAuth2-style token endpoint.
+
+    Sends a ``client_credentials`` grant with HTTP basic auth and expects a JSON
+    body containing ``access_token`` and ``expires_in`` (seconds).
+    """
+    basic = base64.b64encode(f"{credentials.username}:{credentials.password}".encode()).decode()
+    body = urllib.parse.urlencode({"grant_type": "client_credentials"}).encode()
+    request = urllib.request.Request(
+        url,
+        data=body,
+        headers={
+            "Authorization": f"Basic {basic}",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept": "application/json",
+        },
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        payload = json.loads(response.read().decode())
+
+    if "access_token" not in payload:
+        raise ValueError(f"Token endpoint {url} did not return an access_token")
+    expires_in = float(payload.get("expires_in", 3600))
+    return Token(
+        access_token=payload["access_token"],
+        token_type=payload.get("token_type", "Bearer").capitalize(),
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=expires_in),
+    )
+
+
+class TokenCache:
+    """
+    Thread- and process-safe cache of bearer tokens keyed by an arbitrary string.
+
+    Tokens are refreshed ``refresh_margin`` seconds before they expire. While a
+    token is still valid only one caller refreshes it and the others keep using
+    the current one, so a refresh never stalls concurrent downloads. When
+    ``cache_dir`` is set, tokens are persisted there under a file lock so that
+    separate processes share a single login.
+    """
+
+    def __init__(self, cache_dir: Optional[str | Path] = None, refresh_margin: float = 60.0):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[str, Token] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str, fetch: Callable[[], Token]) -> Token:
+        """Return a valid token for ``key``, calling ``fetch`` only when needed."""
+        token = self._tokens.get(key)
+        if token is not None and not token.expires_within(self.refresh_margin):
+            return token
+
+        lock = self._lock_for(key)
+        if token is not None and not token.expires_within(0):
+            # Still usable: refresh ahead of expiry unless someone else already is.
+            if not lock.acquire(blocking=False):
+                return token
+            try:
+                return self._refresh(key, fetch)
+            except Exception:
+                return token
+            finally:
+                lock.release()
+
+        with lock:
+            return self._refresh(key, fetch)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a token, e.g. after the server rejected it."""
+        with self._lock_for(key):
+            self._tokens.pop(key, None)
+            if self.cache_dir is not None:
+                with self._file_lock(key):
+                    self._path_for(key).unlink(missing_ok=True)
+
+    def _refresh(self, key: str, fetch: Callable[[], Token]) -> Token:
+        """Fetch a new token; caller must hold the key's thread lock."""
+        token = self._tokens.get(key)
+        if token is not None and not token.expires_within(self.refresh_margin):
+            return token  # refreshed by another thread while we waited
+
+        if self.cache_dir is None:
+            token = fetch()
+        else:
+            with self._file_lock(key):
+                token = self._read(key)
+                if token is None or token.expires_within(self.refresh_margin):
+                    token = fetch()
+                    self._write(key, token)
+
+        self._tokens[key] = token
+        return token
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _path_for(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return self.cache_dir / f"{digest}.json"
+
+    @contextmanager
+    def _file_lock(self, key: str) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(self._path_for(key).with_suffix(".lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read(self, key: str) -> Optional[Token]:
+        path = self._path_for(key)
+        try:
+            return Token.model_validate_json(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, token: Token) -> None:
+        path = self._path_for(key)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as handle:
+                handle.write(token.model_dump_json())
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import logging
+import sys
+from typing import List, Optional
+
+from .plugins.base import BasePlugin
+from .plugins.registry import register_plugin
+
+
+def load_plugin(spec: str) -> None:
+    """
+    Import a plugin given as ``module`` or ``module:attribute``.
+
+    A bare module is expected to register its plugins on import; an attribute
+    naming a BasePlugin subclass or instance is registered directly.
+    """
+    module_name, _, attr = spec.partition(":")
+    module = importlib.import_module(module_name)
+    if not attr:
+        return
+    obj = getattr(module, attr)
+    if isinstance(obj, type) and issubclass(obj, BasePlugin):
+        obj = obj()
+    if not isinstance(obj, BasePlugin):
+        raise ValueError(f"'{spec}' is not a BasePlugin subclass or instance")
+    register_plugin(obj)
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from .core.server import QueryService, create_server
+
+    for spec in args.plugin:
+        load_plugin(spec)
+    service = QueryService(args.data_dir, max_workers=args.workers, listing_ttl=args.listing_ttl)
+    server = create_server(service, host=args.host, port=args.port, socket_path=args.socket)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    logging.getLogger(__name__).info("rskit serve listening on %s", where)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+def _loadtest(args: argparse.Namespace) -> int:
+    from .core.loadtest import run_load_test
+    from .plugins.synthetic import SyntheticConfig
+
+    config = SyntheticConfig(
+        days=args.days,
+        tile_degrees=args.tile_degrees,
+        shape=tuple(args.shape),
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    report = run_load_test(
+        queries=args.queries,
+        concurrency=args.concurrency,
+        config=config,
+        bbox_degrees=args.bbox_degrees,
+        query_days=args.query_days,
+        max_workers=args.workers,
+        seed=args.seed,
+    )
+    if args.json:
+        print(report.model_dump_json(indent=2))
+    else:
+        for name, value in report.model_dump().items():
+            print(f"{name:>22}: {value:.3f}" if isinstance(value, float) else f"{name:>22}: {value}")
+    return 0 if report.failures == 0 else 1
+
+
+def _synthetic(args: argparse.Namespace) -> int:
+    from .plugins.synthetic import SyntheticConfig, SyntheticServer
+
+    config = SyntheticConfig.model_validate_json(args.config)
+    with SyntheticServer(config, root=args.root, host=args.host, port=args.port) as server:
+        print(server.url, flush=True)
+        sys.stdin.read()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the ``rskit`` command-line parser."""
+    parser = argparse.ArgumentParser(prog="rskit", description="Remote sensing data query toolkit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run a resident query daemon with warm caches")
+    serve.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    serve.add_argument("--socket", help="Listen on this Unix socket instead of TCP")
+    serve.add_argument("--data-dir", default="rskit-data", help="Directory downloads are stored in")
+    serve.add_argument("--plugin", action="append", default=[], help="Plugin to load, as module or module:Class")
+    serve.add_argument("--workers", type=int, default=16, help="Maximum parallel transfers")
+    serve.add_argument("--listing-ttl", type=float, default=900.0, help="Seconds to cache source listings")
+    serve.set_defaults(func=_serve)
+
+    loadtest = commands.add_parser("loadtest", help="Run concurrent queries against a local synthetic archive")
+    loadtest.add_argument("--queries", type=int, default=100, help="Number of queries to run")
+    loadtest.add_argument("--concurrency", type=int, default=8, help="Queries in flight at once")
+    loadtest.add_argument("--workers", type=int, default=16, help="Maximum parallel transfers")
+    loadtest.add_argument("--days", type=int, default=30, help="Days in the synthetic archive")
+    loadtest.add_argument("--tile-degrees", type=float, default=30.0, help="Granule footprint size in degrees")
+    loadtest.add_argument("--shape", type=int, nargs=2, default=[180, 360], metavar=("NY", "NX"), help="Grid size per granule")
+    loadtest.add_argument("--bbox-degrees", type=float, default=10.0, help="Query bounding box size in degrees")
+    loadtest.add_argument("--query-days", type=int, default=1, help="Days covered by each query")
+    loadtest.add_argument("--latency", type=float, default=0.0, help="Seconds of latency injected per server request")
+    loadtest.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of server requests that fail with HTTP 503")
+    loadtest.add_argument("--seed", type=int, default=0, help="Seed for the workload and injected failures")
+    loadtest.add_argument("--json", action="store_true", help="Print the report as JSON")
+    loadtest.set_defaults(func=_loadtest)
+
+    synthetic = commands.add_parser("synthetic", help="Serve a synthetic archive until stdin is closed")
+    synthetic.add_argument("--config", default="{}", help="SyntheticConfig as JSON")
+    synthetic.add_argument("--root", help="Directory generated granules are cached in")
+    synthetic.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    synthetic.add_argument("--port", type=int, default=0, help="TCP port (default: any free port)")
+    synthetic.set_defaults(func=_synthetic)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``rskit`` / ``python -m rskit``."""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
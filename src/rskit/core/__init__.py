@@ -3,3 +3,27 @@ Core functionality for RS-Kit.
 
 This module contains the main processing and query execution logic.
 """
+
+from .cache import ListingCache
+from .executor import discover, execute, execute_many, load
+from .memory import MemoryBudget, SpillingStore
+from .scheduler import AIMDController, DownloadScheduler, SharedDownloads, ThrottledError, TokenBucket
+from .server import QueryClient, QueryService, create_server
+
+__all__ = [
+    "AIMDController",
+    "DownloadScheduler",
+    "ListingCache",
+    "MemoryBudget",
+    "QueryClient",
+    "QueryService",
+    "SharedDownloads",
+    "SpillingStore",
+    "ThrottledError",
+    "TokenBucket",
+    "create_server",
+    "discover",
+    "execute",
+    "execute_many",
+    "load",
+]
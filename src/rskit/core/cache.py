@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from ..models.granule import Granule
+from ..models.query import Query
+
+
+class ListingCache:
+    """
+    In-memory cache of plugin discovery results with a time-to-live.
+
+    Entries are keyed by source, variable and extents, so repeated queries for
+    the same data skip the remote listing.
+    """
+
+    def __init__(self, ttl: float = 900.0, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, List[Granule]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(source: str, query: Query) -> Tuple[str, str]:
+        """Cache key for a source and the parts of a query that affect listings."""
+        return source, query.model_dump_json(include={"variable", "spatial", "temporal"})
+
+    def get(self, source: str, query: Query) -> Optional[List[Granule]]:
+        """Return cached granules, or None if missing or expired."""
+        key = self.key(source, query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored, granules = entry
+            if self._clock() - stored > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return granules
+
+    def put(self, source: str, query: Query, granules: List[Granule]) -> None:
+        """Store discovery results."""
+        with self._lock:
+            self._entries[self.key(source, query)] = (self._clock(), list(granules))
+            self._entries.move_to_end(self.key(source, query))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.granule import Granule
+from ..models.query import Query, SpatialExtent, TemporalExtent
+from ..plugins.base import BasePlugin
+from ..plugins.registry import get_plugin
+from ..utils.dates import as_utc
+from ..utils.geo import FootprintIndex
+from ..utils.reproject import get_resampling_weights, grid_axes, is_geographic
+from ..utils.units import parse_size
+from .cache import ListingCache
+from .memory import MemoryBudget, SpillingStore
+from .scheduler import DownloadScheduler, SharedDownloads
+
+
+def _list(query: Query, plugin: BasePlugin, cache: Optional[ListingCache]) -> List[Granule]:
+    if cache is None:
+        return plugin.discover(query)
+    granules = cache.get(plugin.name, query)
+    if granules is None:
+        granules = plugin.discover(query)
+        cache.put(plugin.name, query, granules)
+    return granules
+
+
+def _overlaps_in_time(granule: Granule, temporal: TemporalExtent) -> bool:
+    if granule.start is not None and as_utc(granule.start) > as_utc(temporal.end):
+        return False
+    if granule.end is not None and as_utc(granule.end) < as_utc(temporal.start):
+        return False
+    return True
+
+
+def discover(query: Query, plugin: BasePlugin, cache: Optional[ListingCache] = None) -> List[Granule]:
+    """
+    List the granules a plugin offers for a query.
+
+    Queries crossing the antimeridian are split into non-wrapping sub-boxes so
+    plugins only ever see plain boxes. Granules returned by both halves are
+    kept once, and all results are filtered against the original extents.
+    Listings are served from ``cache`` when given.
+    """
+    boxes = query.spatial.split()
+    if len(boxes) == 1:
+        granules = _list(query, plugin, cache)
+    else:
+        seen: Dict[str, Granule] = {}
+        for box in boxes:
+            for granule in _list(query.model_copy(update={"spatial": box}), plugin, cache):
+                seen.setdefault(granule.key, granule)
+        granules = list(seen.values())
+    return [g for g in FootprintIndex(granules).query(query.spatial) if _overlaps_in_time(g, query.temporal)]
+
+
+def execute(
+    query: Query,
+    dest_dir: str | Path,
+    scheduler: Optional[DownloadScheduler] = None,
+    cache: Optional[ListingCache] = None,
+    downloads: Optional[SharedDownloads] = None,
+) -> Dict[str, List[Path]]:
+    """
+    Run a query: discover granules for every source and download each one once.
+
+    Pass ``downloads`` to share in-flight transfers with concurrent queries;
+    its scheduler is then used. Returns the local file paths per source name.
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    if downloads is not None:
+        scheduler = downloads.scheduler
+    owns_scheduler = scheduler is None
+    if scheduler is None:
+        scheduler = DownloadScheduler()
+    if downloads is None:
+        downloads = SharedDownloads(scheduler)
+
+    futures: Dict[str, Dict[str, Future]] = {}
+    try:
+        for source in query.sources:
+            plugin = get_plugin(source)
+            futures[source] = downloads.submit(plugin, discover(query, plugin, cache), dest_dir)
+        return {source: [f.result() for f in pending.values()] for source, pending in futures.items()}
+    finally:
+        # On failure, drop the downloads still queued so closing does not wait for them.
+        for pending in futures.values():
+            downloads.release(pending)
+        if owns_scheduler:
+            scheduler.close()
+
+
+def _lon_envelope(boxes: Sequence[SpatialExtent]) -> Tuple[float, float]:
+    """
+    Narrowest longitude range covering non-wrapping ``boxes``.
+
+    The range is the complement of the widest longitude gap between the
+    boxes, so it crosses the antimeridian (``lon_max < lon_min``) when the
+    widest gap does not.
+    """
+    merged: List[List[float]] = []
+    for lon_min, lon_max in sorted((b.lon_min, b.lon_max) for b in boxes):
+        if merged and lon_min <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], lon_max)
+        else:
+            merged.append([lon_min, lon_max])
+    gap = (merged[0][0] + 180.0) + (180.0 - merged[-1][1])
+    envelope = (merged[0][0], merged[-1][1])
+    for (_, west_end), (east_start, _) in zip(merged, merged[1:]):
+        if east_start - west_end > gap:
+            gap, envelope = east_start - west_end, (east_start, west_end)
+    return envelope
+
+
+def _envelope(queries: Sequence[Query]) -> Tuple[SpatialExtent, TemporalExtent]:
+    """Smallest box, wrapping across the antimeridian if that is narrower, and time range covering all queries."""
+    boxes = [box for q in queries for box in q.spatial.split()]
+    lon_min, lon_max = _lon_envelope(boxes)
+    spatial = SpatialExtent(
+        lon_min=lon_min,
+        lon_max=lon_max,
+        lat_min=min(b.lat_min for b in boxes),
+        lat_max=max(b.lat_max for b in boxes),
+    )
+    temporal = TemporalExtent(
+        start=min(as_utc(q.temporal.start) for q in queries),
+        end=max(as_utc(q.temporal.end) for q in queries),
+    )
+    return spatial, temporal
+
+
+def _time_windows(queries: Sequence[Query], members: Sequence[int]) -> List[List[int]]:
+    """Split ``members`` into runs whose time ranges overlap, chaining through shared members."""
+    windows: List[List[int]] = []
+    end = None
+    for i in sorted(members, key=lambda i: as_utc(queries[i].temporal.start)):
+        start = as_utc(queries[i].temporal.start)
+        if end is None or start > end:
+            windows.append([])
+            end = as_utc(queries[i].temporal.end)
+        windows[-1].append(i)
+        end = max(end, as_utc(queries[i].temporal.end))
+    return windows
+
+
+def _spatial_clusters(queries: Sequence[Query], members: Sequence[int]) -> List[List[int]]:
+    """
+    Split ``members`` into clusters of nearby boxes.
+
+    Boxes are hashed onto a grid with cells the size of the largest box and
+    members in the same or adjacent cells are chained together, so boxes
+    closer than about one box size share a cluster. Longitude cells wrap
+    around the antimeridian.
+    """
+    spans = {}
+    for i in members:
+        spatial = queries[i].spatial
+        lon_max = spatial.lon_max + 360.0 if spatial.crosses_antimeridian else spatial.lon_max
+        spans[i] = (spatial.lon_min + 180.0, spatial.lat_min + 90.0, lon_max + 180.0, spatial.lat_max + 90.0)
+    cell = max(max(x1 - x0, y1 - y0) for x0, y0, x1, y1 in spans.values()) or 1e-6
+    columns = max(int(np.ceil(360.0 / cell)), 1)
+
+    parent = {i: i for i in members}
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owners: Dict[Tuple[int, int], int] = {}
+    for i, (x0, y0, x1, y1) in spans.items():
+        columns_spanned = range(int(x0 // cell) - 1, int(x1 // cell) + 2)
+        if len(columns_spanned) >= columns:
+            columns_spanned = range(columns)
+        for cx in columns_spanned:
+            for cy in range(int(y0 // cell) - 1, int(y1 // cell) + 2):
+                key = (cx % columns, cy)
+                if key in owners:
+                    parent[root(i)] = root(owners[key])
+                else:
+                    owners[key] = i
+
+    clusters: Dict[int, List[int]] = defaultdict(list)
+    for i in members:
+        clusters[root(i)].append(i)
+    return list(clusters.values())
+
+
+def _clusters(queries: Sequence[Query], members: Sequence[int]) -> List[List[int]]:
+    """Split a group into members overlapping in time and lying near each other, to be listed together."""
+    return [
+        cluster
+        for window in _time_windows(queries, members)
+        for cluster in _spatial_clusters(queries, window)
+    ]
+
+
+def execute_many(
+    queries: Sequence[Query],
+    dest_dir: str | Path,
+    scheduler: Optional[DownloadScheduler] = None,
+    cache: Optional[ListingCache] = None,
+) -> List[Dict[str, List[Path]]]:
+    """
+    Run many queries as one batch.
+
+    Queries are grouped by source, variable and options, and each group is
+    clustered into members whose time ranges overlap and whose boxes lie
+    close together. Each cluster is discovered once over the envelope of its
+    members' extents, so scattered queries are not listed over the whole
+    globe or year. Every granule needed by any member is downloaded once, and
+    the results are split back out per query. Returns one ``{source: [paths]}`` mapping per query, in order.
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    owns_scheduler = scheduler is None
+    if scheduler is None:
+        scheduler = DownloadScheduler()
+
+    groups: Dict[Tuple[str, str, str], List[int]] = defaultdict(list)
+    for i, query in enumerate(queries):
+        options = json.dumps(query.options, sort_keys=True, default=str)
+        for source in query.sources:
+            groups[(source, query.variable, options)].append(i)
+
+    futures: Dict[str, Future] = {}
+    try:
+        # Per query and source, the keys of the granules it needs.
+        needed: List[Dict[str, List[str]]] = [{} for _ in queries]
+        for (source, _, _), members in groups.items():
+            plugin = get_plugin(source)
+            for cluster in _clusters(queries, members):
+                spatial, temporal = _envelope([queries[i] for i in cluster])
+                batch = queries[cluster[0]].model_copy(update={"spatial": spatial, "temporal": temporal})
+                index = FootprintIndex(discover(batch, plugin, cache))
+
+                wanted: Dict[str, Granule] = {}
+                for i in cluster:
+                    hits = [g for g in index.query(queries[i].spatial) if _overlaps_in_time(g, queries[i].temporal)]
+                    needed[i][source] = [g.key for g in hits]
+                    for granule in hits:
+                        wanted.setdefault(granule.key, granule)
+
+                fresh = [g for key, g in wanted.items() if key not in futures]
+                futures.update(scheduler.submit_downloads(plugin, fresh, dest_dir))
+
+        paths = {key: future.result() for key, future in futures.items()}
+        return [
+            {source: [paths[key] for key in needed[i].get(source, [])] for source in query.sources}
+            for i, query in enumerate(queries)
+        ]
+    finally:
+        for future in futures.values():
+            future.cancel()
+        if owns_scheduler:
+            scheduler.close()
+
+
+def _target_grid(query: Query) -> Optional[Tuple[np.ndarray, np.ndarray, str]]:
+    """Output grid axes and CRS for ``load``, or None to keep granules on their native grid."""
+    crs = query.spatial.crs
+    if is_geographic(crs):
+        return None
+    resolution = query.options.get("resolution")
+    if resolution is None:
+        raise ValueError(f"options['resolution'] is required to load data in {crs}")
+    x, y = grid_axes(query.spatial.bounds(), float(resolution))
+    return x, y, crs
+
+
+def load(
+    query: Query,
+    dest_dir: str | Path,
+    scheduler: Optional[DownloadScheduler] = None,
+    cache: Optional[ListingCache] = None,
+) -> Dict[str, Optional[np.ndarray]]:
+    """
+    Run a query and decode it into one array per source.
+
+    Granules are decoded with ``plugin.open`` and concatenated along the first
+    axis in discovery order (None if a source has no granules). Downloads run
+    on the scheduler; reserving memory and decoding happen on the calling
+    thread as transfers complete, so they neither hold scheduler workers nor
+    count towards transfer times.
+
+    With ``options["memory_limit"]`` (e.g. ``"8GB"``), the memory a granule
+    will need once decoded is reserved before its download is queued. The
+    estimate comes from ``plugin.decoded_size`` or, failing that, from the
+    largest granule of the same source decoded so far; until one has been
+    decoded, a source has a single download in flight. Resampling working
+    memory is charged to the same budget. Decoded pieces are spilled to
+    memory-mapped files under ``options["scratch_dir"]`` (default
+    ``<dest_dir>/.rskit-scratch``) once usage nears the limit or to make room
+    for the next reservation, so new downloads only wait on transfers still
+    in flight. A merged result that does not fit is returned as a
+    memory-mapped array. The limit is only as tight as the estimates: a
+    granule that decodes larger than expected is charged in full after
+    decoding, and resampling weights cached across queries are not counted.
+
+    When ``query.spatial.crs`` is not geographic, every granule is resampled
+    onto a north-up grid over the query bounds in that CRS (the box given to
+    ``SpatialExtent.from_bounds``, if any), with cell size
+    ``options["resolution"]`` in CRS units and ``options["resampling"]``
+    (``"bilinear"`` or ``"nearest"``). Weights are cached per source grid.
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    target = _target_grid(query)
+    method = query.options.get("resampling", "bilinear")
+    limit = query.options.get("memory_limit")
+    budget = MemoryBudget(
+        parse_size(limit) if limit is not None else None,
+        scratch_dir=query.options.get("scratch_dir") or dest_dir / ".rskit-scratch",
+    )
+    store = SpillingStore(budget)
+
+    # Largest memory one granule of each source has needed while decoding.
+    footprints: Dict[str, int] = {}
+
+    def estimate(plugin: BasePlugin, granule: Granule) -> Optional[int]:
+        """Bytes to reserve for ``granule``; None until the source's footprint is known."""
+        known = [n for n in (plugin.decoded_size(granule, query.variable), footprints.get(plugin.name)) if n is not None]
+        return max(known) if known else None
+
+    def decode(plugin: BasePlugin, granule: Granule, download: Future, reserved: int) -> None:
+        """Decode, resample and store a downloaded granule, charging its working memory to the budget."""
+        try:
+            array = np.asarray(plugin.open(download.result(), query.variable))
+            footprint = array.nbytes
+            if target is not None:
+                src_x, src_y, src_crs = plugin.grid(download.result())
+                weights = get_resampling_weights(src_x, src_y, src_crs, *target, method=method)
+                footprint += weights.nbytes + weights.work_bytes(array.shape[:-2])
+                budget.resize(reserved, footprint)
+                reserved = footprint
+                array = weights.apply(array)
+        except BaseException:
+            budget.release(reserved)
+            raise
+        footprints[plugin.name] = max(footprints.get(plugin.name, 0), footprint)
+        store.add(granule.key, array, reserved=reserved)
+
+    owns_scheduler = scheduler is None
+    if scheduler is None:
+        scheduler = DownloadScheduler()
+
+    in_flight: Dict[Future, Tuple[BasePlugin, Granule, int]] = {}
+    try:
+        keys: Dict[str, List[str]] = {}
+        queue: Deque[Tuple[BasePlugin, Granule]] = deque()
+        for source in query.sources:
+            plugin = get_plugin(source)
+            granules = discover(query, plugin, cache)
+            keys[source] = [g.key for g in granules]
+            queue.extend((plugin, g) for g in granules)
+
+        while queue or in_flight:
+            while queue:
+                plugin, granule = queue[0]
+                nbytes = estimate(plugin, granule)
+                if nbytes is None:
+                    # Probe with a single granule until its decoded size is known.
+                    if budget.limit is not None and any(p is plugin for p, _, _ in in_flight.values()):
+                        break
+                    nbytes = granule.size
+                if in_flight:
+                    if not budget.try_reserve(nbytes, make_room=store.make_room):
+                        break
+                else:
+                    # Nothing in flight holds memory, so this cannot wait for long.
+                    budget.reserve(nbytes, make_room=store.make_room)
+                queue.popleft()
+                future = scheduler.submit_downloads(plugin, [granule], dest_dir)[granule.key]
+                in_flight[future] = (plugin, granule, nbytes)
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                plugin, granule, reserved = in_flight.pop(future)
+                decode(plugin, granule, future, reserved)
+
+        return {source: store.merge(source_keys) for source, source_keys in keys.items()}
+    finally:
+        for future in in_flight:
+            future.cancel()
+        budget.cleanup()
+        if owns_scheduler:
+            scheduler.close()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ..models.query import Query, SpatialExtent, TemporalExtent
+from ..plugins.registry import register_plugin, unregister_plugin
+from ..plugins.synthetic import SyntheticConfig, SyntheticPlugin, SyntheticServerProcess
+from .cache import ListingCache
+from .executor import execute
+from .scheduler import DownloadScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class LoadTestReport(BaseModel):
+    """Results of a load test run."""
+    queries: int = Field(..., description="Queries issued")
+    failures: int = Field(..., description="Queries that raised an error")
+    errors: Dict[str, int] = Field(default_factory=dict, description="Failed queries per exception type")
+    concurrency: int = Field(..., description="Queries in flight at once")
+    wall_seconds: float = Field(..., description="Elapsed time for the whole run")
+    p50_latency: float = Field(..., description="Median query latency in seconds")
+    p99_latency: float = Field(..., description="99th percentile query latency in seconds")
+    queries_per_second: float = Field(..., description="Completed queries per second")
+    megabytes_per_second: float = Field(..., description="Download throughput in MB/s")
+    bytes_downloaded: int = Field(..., description="Bytes fetched from the server")
+    server_requests: int = Field(..., description="Requests handled by the synthetic server")
+    peak_rss_mb: Optional[float] = Field(
+        default=None,
+        description="Peak resident set size in MB of the client process only; the server runs in a separate process",
+    )
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB, if the platform reports it."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def random_queries(
+    config: SyntheticConfig,
+    count: int,
+    bbox_degrees: float = 10.0,
+    query_days: int = 1,
+    seed: int = 0,
+    source: str = SyntheticPlugin.name,
+) -> List[Query]:
+    """Random bounding-box queries inside the synthetic archive, addressed to ``source``."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        lon = rng.uniform(-180.0, 180.0 - bbox_degrees)
+        lat = rng.uniform(-90.0, 90.0 - bbox_degrees)
+        start = config.start + timedelta(days=rng.randrange(max(config.days - query_days + 1, 1)))
+        queries.append(Query(
+            variable=config.variable,
+            spatial=SpatialExtent(lon_min=lon, lon_max=lon + bbox_degrees, lat_min=lat, lat_max=lat + bbox_degrees),
+            temporal=TemporalExtent(start=start, end=start + timedelta(days=query_days) - timedelta(seconds=1)),
+            sources=[source],
+        ))
+    return queries
+
+
+def run_load_test(
+    queries: int = 100,
+    concurrency: int = 8,
+    config: Optional[SyntheticConfig] = None,
+    bbox_degrees: float = 10.0,
+    query_days: int = 1,
+    max_workers: int = 16,
+    listing_ttl: float = 900.0,
+    data_dir: Optional[str | Path] = None,
+    seed: int = 0,
+) -> LoadTestReport:
+    """
+    Run ``queries`` random queries, ``concurrency`` at a time, against a local synthetic archive.
+
+    All queries share one scheduler and listing cache, as they would inside
+    ``rskit serve``, so the report reflects caching and adaptive concurrency.
+    The synthetic server runs in a child process, so latencies and peak RSS
+    measure the client alone. Its plugin is registered under a unique name,
+    leaving any ``synthetic`` plugin registered by the caller untouched.
+    Failed queries are logged and counted per exception type.
+    """
+    config = config or SyntheticConfig()
+    source = f"{SyntheticPlugin.name}-loadtest-{uuid.uuid4().hex[:8]}"
+    workload = random_queries(
+        config, queries, bbox_degrees=bbox_degrees, query_days=query_days, seed=seed, source=source,
+    )
+    errors: Counter[str] = Counter()
+    errors_lock = threading.Lock()
+
+    with SyntheticServerProcess(config) as server, tempfile.TemporaryDirectory(prefix="rskit-loadtest-") as tmp:
+        dest_dir = Path(data_dir) if data_dir is not None else Path(tmp)
+        plugin = register_plugin(SyntheticPlugin(server.url, name=source))
+        scheduler = DownloadScheduler(max_workers=max_workers)
+        cache = ListingCache(ttl=listing_ttl)
+
+        def timed(query: Query) -> Optional[float]:
+            started = time.perf_counter()
+            try:
+                execute(query, dest_dir, scheduler=scheduler, cache=cache)
+            except Exception as e:
+                logger.warning("Load test query failed: %s: %s", type(e).__name__, e)
+                with errors_lock:
+                    errors[type(e).__name__] += 1
+                return None
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                latencies = list(pool.map(timed, workload))
+        finally:
+            scheduler.close()
+            unregister_plugin(plugin.name)
+        wall = time.perf_counter() - started
+        server_requests = server.stats()["requests"]
+
+    completed = np.array([t for t in latencies if t is not None])
+    return LoadTestReport(
+        queries=queries,
+        failures=sum(t is None for t in latencies),
+        errors=dict(errors),
+        concurrency=concurrency,
+        wall_seconds=wall,
+        p50_latency=float(np.percentile(completed, 50)) if completed.size else float("nan"),
+        p99_latency=float(np.percentile(completed, 99)) if completed.size else float("nan"),
+        queries_per_second=completed.size / wall if wall > 0 else 0.0,
+        megabytes_per_second=plugin.bytes_downloaded / 1e6 / wall if wall > 0 else 0.0,
+        bytes_downloaded=plugin.bytes_downloaded,
+        server_requests=server_requests,
+        peak_rss_mb=peak_rss_mb(),
+    )
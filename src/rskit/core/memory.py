@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class MemoryBudget:
+    """
+    Byte budget shared by the download and decode stages of a query.
+
+    ``reserve`` blocks while the budget is exhausted, which stops new granules
+    from being fetched and decoded until memory is released. Callers holding
+    spillable data pass ``make_room``, which is asked to free memory before
+    any waiting, so only reservations that cannot be spilled (e.g. transfers
+    still in flight) are waited on. A single reservation larger than the
+    whole budget is admitted when nothing else is held, so an oversized
+    granule cannot deadlock the query. With ``limit=None`` the budget only
+    keeps count.
+    """
+
+    def __init__(self, limit: Optional[int] = None, high_water: float = 0.8, scratch_dir: Optional[str | Path] = None):
+        self.limit = limit
+        self.high_water = high_water
+        self.scratch_dir = Path(scratch_dir) if scratch_dir is not None else None
+        self.peak = 0
+        self._used = 0
+        self._cond = threading.Condition()
+        self._scratch: List[Path] = []
+
+    @property
+    def used(self) -> int:
+        """Bytes currently reserved."""
+        return self._used
+
+    @property
+    def near_limit(self) -> bool:
+        """True once usage passes the high-water mark and pieces should be spilled."""
+        return self.limit is not None and self._used > self.high_water * self.limit
+
+    def reserve(
+        self,
+        nbytes: int,
+        timeout: Optional[float] = None,
+        make_room: Optional[Callable[[int], bool]] = None,
+    ) -> None:
+        """
+        Reserve ``nbytes``, waiting for other holders to release memory if needed.
+
+        ``make_room(nbytes)`` is called repeatedly while the reservation does
+        not fit and should free some memory, returning False once it cannot
+        or freeing memory would not let ``nbytes`` fit.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._make_fit(nbytes, make_room), timeout=timeout):
+                raise TimeoutError(f"Could not reserve {nbytes} bytes within the memory limit of {self.limit} bytes")
+            self._add(nbytes)
+
+    def try_reserve(self, nbytes: int, make_room: Optional[Callable[[int], bool]] = None) -> bool:
+        """Reserve ``nbytes`` if they fit, after ``make_room``; never waits."""
+        with self._cond:
+            if not self._make_fit(nbytes, make_room):
+                return False
+            self._add(nbytes)
+            return True
+
+    def fits(self, nbytes: int, freed: int = 0) -> bool:
+        """True if ``nbytes`` could be reserved now, or once ``freed`` bytes were released."""
+        used = self._used - freed
+        return self.limit is None or used <= 0 or used + nbytes <= self.limit
+
+    def resize(self, old: int, new: int) -> None:
+        """Replace a reservation of ``old`` bytes by ``new`` bytes without waiting."""
+        with self._cond:
+            self._add(new - old)
+            self._cond.notify_all()
+
+    def release(self, nbytes: int) -> None:
+        """Return ``nbytes`` to the budget."""
+        with self._cond:
+            self._add(-nbytes)
+            self._cond.notify_all()
+
+    def scratch_array(self, shape: Sequence[int], dtype: np.dtype, keep: bool = False) -> np.memmap:
+        """
+        Create a writable memory-mapped array backed by a scratch file.
+
+        Files are removed by :meth:`cleanup` unless ``keep`` is set, e.g. for
+        results handed back to the caller.
+        """
+        if self.scratch_dir is not None:
+            self.scratch_dir.mkdir(parents=True, exist_ok=True)
+        prefix = "rskit-result-" if keep else "rskit-spill-"
+        with tempfile.NamedTemporaryFile(dir=self.scratch_dir, prefix=prefix, suffix=".dat", delete=False) as handle:
+            path = Path(handle.name)
+        if not keep:
+            with self._cond:
+                self._scratch.append(path)
+        return np.memmap(path, dtype=dtype, mode="w+", shape=tuple(shape))
+
+    def spill(self, array: np.ndarray) -> np.memmap:
+        """Copy ``array`` into a memory-mapped scratch file and return the mapping."""
+        mapped = self.scratch_array(array.shape, array.dtype)
+        mapped[...] = array
+        mapped.flush()
+        return mapped
+
+    def cleanup(self) -> None:
+        """Delete scratch files created by :meth:`spill`."""
+        with self._cond:
+            paths, self._scratch = self._scratch, []
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _make_fit(self, nbytes: int, make_room: Optional[Callable[[int], bool]]) -> bool:
+        """True once ``nbytes`` fit, calling ``make_room`` until they do; caller holds the condition."""
+        while not self.fits(nbytes):
+            if make_room is None or not make_room(nbytes):
+                return False
+        return True
+
+    def _add(self, nbytes: int) -> None:
+        self._used += nbytes
+        self.peak = max(self.peak, self._used)
+
+
+class SpillingStore:
+    """
+    Decoded pieces of a query held against a :class:`MemoryBudget`.
+
+    When usage passes the budget's high-water mark, the largest in-memory
+    pieces are moved to memory-mapped scratch files and their bytes released.
+    """
+
+    def __init__(self, budget: MemoryBudget):
+        self.budget = budget
+        self._pieces: Dict[str, np.ndarray] = {}
+        self._resident: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, array: np.ndarray, reserved: int = 0) -> None:
+        """Store a decoded piece, converting a prior reservation of ``reserved`` bytes to its actual size."""
+        self.budget.resize(reserved, array.nbytes)
+        with self._lock:
+            self._pieces[key] = array
+            self._resident[key] = array.nbytes
+        if self.budget.near_limit:
+            self.spill()
+
+    @property
+    def resident_bytes(self) -> int:
+        """Bytes of pieces held in memory, i.e. what spilling could release."""
+        with self._lock:
+            return sum(self._resident.values())
+
+    def make_room(self, nbytes: int) -> bool:
+        """
+        Spill the largest resident piece if spilling could let ``nbytes`` fit.
+
+        Usable as ``make_room`` for :meth:`MemoryBudget.reserve`. Returns False
+        without touching disk when memory held by others (e.g. transfers in
+        flight) would still leave too little room.
+        """
+        if not self.budget.fits(nbytes, freed=self.resident_bytes):
+            return False
+        return self.spill_largest()
+
+    def spill(self) -> None:
+        """Spill resident pieces, largest first, until usage is below the high-water mark."""
+        while self.budget.near_limit and self.spill_largest():
+            pass
+
+    def spill_largest(self) -> bool:
+        """Spill the largest resident piece; False if none is left."""
+        with self._lock:
+            if not self._resident:
+                return False
+            key = max(self._resident, key=self._resident.get)
+            nbytes = self._resident.pop(key)
+            array = self._pieces[key]
+        mapped = self.budget.spill(array)
+        with self._lock:
+            self._pieces[key] = mapped
+        self.budget.release(nbytes)
+        return True
+
+    def merge(self, keys: Sequence[str], axis: int = 0) -> Optional[np.ndarray]:
+        """
+        Concatenate pieces along ``axis`` and drop them from the store.
+
+        The result is built in memory if it fits in the budget, otherwise in a
+        memory-mapped scratch file that outlives :meth:`MemoryBudget.cleanup`.
+        Returns None when ``keys`` is empty.
+        """
+        with self._lock:
+            pieces = [self._pieces.pop(k) for k in keys]
+            resident = sum(self._resident.pop(k, 0) for k in keys)
+        if not pieces:
+            return None
+
+        shape = list(pieces[0].shape)
+        shape[axis] = sum(p.shape[axis] for p in pieces)
+        dtype = np.result_type(*pieces)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+
+        limit = self.budget.limit
+        if limit is None or self.budget.used - resident + nbytes <= limit:
+            merged = np.concatenate(pieces, axis=axis)
+            self.budget.resize(resident, nbytes)
+            return merged
+
+        merged = self.budget.scratch_array(shape, dtype, keep=True)
+        offset = 0
+        index = [slice(None)] * len(shape)
+        for piece in pieces:
+            index[axis] = slice(offset, offset + piece.shape[axis])
+            merged[tuple(index)] = piece
+            offset += piece.shape[axis]
+        merged.flush()
+        self.budget.release(resident)
+        return merged
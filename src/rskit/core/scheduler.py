@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import errno
+import ftplib
+import heapq
+import http.client
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+
+from ..models.granule import Granule
+from ..plugins.base import BasePlugin, RateLimit, ThrottledError
+
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_NETWORK_ERRORS = (ConnectionError, TimeoutError, http.client.HTTPException, ftplib.error_temp)
+_NETWORK_ERRNOS = {errno.ENETDOWN, errno.ENETUNREACH, errno.ENETRESET, errno.EHOSTDOWN, errno.EHOSTUNREACH}
+
+
+def _is_transient(error: BaseException) -> bool:
+    """
+    True for throttling and network errors, which are worth retrying and signal host load.
+
+    Other errors, including local I/O failures such as a full disk, fail the
+    transfer straight away.
+    """
+    if isinstance(error, ThrottledError):
+        return True
+    if isinstance(error, HTTPError):
+        return error.code in _RETRYABLE_STATUS
+    if isinstance(error, URLError):
+        # urlopen wraps socket errors; the reason tells a dropped connection from a bad URL.
+        return isinstance(error.reason, BaseException) and _is_transient(error.reason)
+    if isinstance(error, _NETWORK_ERRORS):
+        return True
+    return isinstance(error, OSError) and error.errno in _NETWORK_ERRNOS
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit for one host.
+
+    The limit grows by ``increase`` once per window of ``limit`` successful
+    transfers and is multiplied by ``decrease`` on errors, throttling, or when
+    the cost per byte of a transfer rises above ``latency_factor`` times the
+    best observed cost (a sign the host or link is saturated).
+    """
+
+    def __init__(
+        self,
+        initial: int = 2,
+        minimum: int = 1,
+        maximum: int = 16,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_factor: float = 2.0,
+        smoothing: float = 0.3,
+    ):
+        if not minimum <= initial <= maximum:
+            raise ValueError(f"initial ({initial}) must be between minimum ({minimum}) and maximum ({maximum})")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.smoothing = smoothing
+        self._limit = float(initial)
+        self._successes = 0
+        self._cost: Optional[float] = None
+        self._best_cost: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Current number of transfers allowed in parallel."""
+        return int(self._limit)
+
+    def record_success(self, nbytes: int, seconds: float) -> None:
+        """Feed back a completed transfer."""
+        cost = seconds / nbytes if nbytes > 0 else seconds
+        with self._lock:
+            self._cost = cost if self._cost is None else self.smoothing * cost + (1 - self.smoothing) * self._cost
+            if self._best_cost is None or self._cost < self._best_cost:
+                self._best_cost = self._cost
+
+            if self._best_cost > 0 and self._cost > self.latency_factor * self._best_cost:
+                self._backoff()
+                return
+
+            self._successes += 1
+            if self._successes >= self.limit:
+                self._successes = 0
+                self._limit = min(float(self.maximum), self._limit + self.increase)
+
+    def record_failure(self) -> None:
+        """Feed back a failed or throttled transfer."""
+        with self._lock:
+            self._backoff()
+
+    def _backoff(self) -> None:
+        self._successes = 0
+        self._limit = max(float(self.minimum), self._limit * self.decrease)
+        # Re-learn the baseline so a permanently slower link does not pin us at the minimum.
+        self._best_cost = self._cost
+
+
+class TokenBucket:
+    """Thread-safe token bucket enforcing a :class:`RateLimit`."""
+
+    def __init__(self, rate_limit: RateLimit, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate_limit.requests_per_second
+        self.capacity = float(rate_limit.burst)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token if available; otherwise return the seconds to wait for one."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+@dataclass(order=True)
+class _Task:
+    sort_key: Tuple[Any, ...]
+    host: str = field(compare=False)
+    source: Optional[str] = field(compare=False)
+    size: int = field(compare=False)
+    fn: Callable[[], Any] = field(compare=False)
+    future: Future = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+    not_before: float = field(default=0.0, compare=False)
+
+
+class DownloadScheduler:
+    """
+    Priority queue of transfers with adaptive per-host concurrency.
+
+    Tasks are ordered by ``priority`` (lower first) and then by size, smallest
+    first unless ``largest_first`` is set. A task only starts when its host is
+    below the limit chosen by its :class:`AIMDController` and its source's
+    :class:`RateLimit` has a token to spare.
+
+    Each host has its own heap, so picking the next task only looks at the
+    head of each host's queue, and saturated hosts are skipped without
+    touching their backlog. Retries wait in a separate heap until due.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        largest_first: bool = False,
+        max_retries: int = 2,
+        controller_factory: Callable[[], AIMDController] = AIMDController,
+    ):
+        self.max_workers = max_workers
+        self.largest_first = largest_first
+        self.max_retries = max_retries
+        self.controller_factory = controller_factory
+        self.controllers: Dict[str, AIMDController] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._host_caps: Dict[str, int] = {}
+        self._active: Dict[str, int] = {}
+        self._queues: Dict[str, List[_Task]] = {}
+        self._delayed: List[Tuple[float, int, _Task]] = []
+        self._pending = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._workers = [threading.Thread(target=self._work, daemon=True) for _ in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def set_rate_limit(self, source: str, rate_limit: RateLimit) -> None:
+        """Declare the rate limit for a source; shared by all of its hosts."""
+        with self._cond:
+            if source not in self._buckets:
+                self._buckets[source] = TokenBucket(rate_limit)
+
+    def submit(
+        self,
+        host: str,
+        fn: Callable[[], Any],
+        size: int = 0,
+        priority: int = 0,
+        source: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> Future:
+        """Queue ``fn`` for execution against ``host`` and return its future."""
+        future: Future = Future()
+        sort_size = -size if self.largest_first else size
+        task = _Task((priority, sort_size, next(self._seq)), host, source, size, fn, future)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Cannot submit to a closed scheduler")
+            if host not in self.controllers:
+                self.controllers[host] = self.controller_factory()
+            if max_concurrency is not None:
+                self._host_caps[host] = max_concurrency
+            self._enqueue(task)
+            self._cond.notify()
+        return future
+
+    def submit_downloads(
+        self,
+        plugin: BasePlugin,
+        granules: List[Granule],
+        dest_dir: Path,
+        priority: int = 0,
+    ) -> Dict[str, Future]:
+        """Queue ``plugin.download`` for each granule; returns futures keyed by granule key."""
+        max_concurrency = None
+        if plugin.rate_limit is not None:
+            self.set_rate_limit(plugin.name, plugin.rate_limit)
+            max_concurrency = plugin.rate_limit.max_concurrency
+        futures = {}
+        for granule in granules:
+            futures[granule.key] = self.submit(
+                urlparse(granule.url).netloc or plugin.name,
+                lambda g=granule: plugin.download(g, dest_dir),
+                size=granule.size,
+                priority=priority,
+                source=plugin.name,
+                max_concurrency=max_concurrency,
+            )
+        return futures
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting work; optionally wait for queued tasks to finish."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def __enter__(self) -> DownloadScheduler:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _host_limit(self, host: str) -> int:
+        limit = self.controllers[host].limit
+        cap = self._host_caps.get(host)
+        return min(limit, cap) if cap is not None else limit
+
+    def _enqueue(self, task: _Task) -> None:
+        """Add a task to its host's heap; caller holds the condition."""
+        heapq.heappush(self._queues.setdefault(task.host, []), task)
+        self._pending += 1
+
+    def _next_task(self) -> Optional[_Task]:
+        """Pop the first runnable task; caller holds the condition. Returns None on shutdown."""
+        while True:
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                task = heapq.heappop(self._delayed)[2]
+                self._pending -= 1
+                self._enqueue(task)
+
+            wait: Optional[float] = self._delayed[0][0] - now if self._delayed else None
+            heads = sorted(
+                queue[0] for host, queue in self._queues.items()
+                if self._active.get(host, 0) < self._host_limit(host)
+            )
+            for task in heads:
+                bucket = self._buckets.get(task.source) if task.source else None
+                delay = bucket.try_acquire() if bucket else 0.0
+                if delay > 0:
+                    wait = delay if wait is None else min(wait, delay)
+                    continue
+                queue = self._queues[task.host]
+                heapq.heappop(queue)
+                if not queue:
+                    del self._queues[task.host]
+                self._pending -= 1
+                self._active[task.host] = self._active.get(task.host, 0) + 1
+                if self._pending:
+                    # A finished task wakes a single worker; pass the wake-up on in case more can start.
+                    self._cond.notify()
+                return task
+            if self._closed and not self._pending:
+                # Finished tasks only wake one worker; make sure every idle one sees the shutdown.
+                self._cond.notify_all()
+                return None
+            self._cond.wait(timeout=wait)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                task = self._next_task()
+            if task is None:
+                return
+            if task.attempts == 0 and not task.future.set_running_or_notify_cancel():
+                self._finish(task)
+                continue
+
+            controller = self.controllers[task.host]
+            started = time.monotonic()
+            try:
+                result = task.fn()
+            except Exception as e:
+                if _is_transient(e):
+                    controller.record_failure()
+                    self._retry_or_fail(task, e)
+                else:
+                    task.future.set_exception(e)
+            else:
+                controller.record_success(task.size, time.monotonic() - started)
+                task.future.set_result(result)
+            self._finish(task)
+
+    def _retry_or_fail(self, task: _Task, error: Exception) -> None:
+        if task.attempts >= self.max_retries:
+            task.future.set_exception(error)
+            return
+        task.attempts += 1
+        retry_after = getattr(error, "retry_after", None)
+        backoff = retry_after if retry_after is not None else 0.5 * 2 ** (task.attempts - 1)
+        task.not_before = time.monotonic() + backoff
+        with self._cond:
+            heapq.heappush(self._delayed, (task.not_before, next(self._seq), task))
+            self._pending += 1
+
+    def _finish(self, task: _Task) -> None:
+        with self._cond:
+            self._active[task.host] -= 1
+            self._cond.notify()
+
+
+class SharedDownloads:
+    """
+    Granule downloads in flight on one scheduler, shared between concurrent callers.
+
+    A granule requested while another caller is already downloading it gets
+    that caller's future instead of a second transfer into the same path.
+    Callers :meth:`release` their futures when done; a queued download is
+    only cancelled once every caller waiting on it has let go.
+    """
+
+    def __init__(self, scheduler: DownloadScheduler):
+        self.scheduler = scheduler
+        # Granule key -> (future, number of callers waiting on it).
+        self._entries: Dict[str, Tuple[Future, int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def submit(self, plugin: BasePlugin, granules: List[Granule], dest_dir: Path) -> Dict[str, Future]:
+        """Like :meth:`DownloadScheduler.submit_downloads`, reusing downloads already in flight."""
+        with self._lock:
+            fresh = [g for g in granules if g.key not in self._entries]
+            submitted = self.scheduler.submit_downloads(plugin, fresh, dest_dir)
+            for key, future in submitted.items():
+                self._entries[key] = (future, 0)
+            futures = {}
+            for granule in granules:
+                future, waiters = self._entries[granule.key]
+                self._entries[granule.key] = (future, waiters + 1)
+                futures[granule.key] = future
+        # Outside the lock: the callback runs at once if the download already finished.
+        for key, future in submitted.items():
+            future.add_done_callback(lambda f, key=key: self._forget(key, f))
+        return futures
+
+    def release(self, futures: Mapping[str, Future]) -> None:
+        """Stop waiting on ``futures``; cancel those no other caller still needs."""
+        unwanted = []
+        with self._lock:
+            for key, future in futures.items():
+                entry = self._entries.get(key)
+                if entry is None or entry[0] is not future:
+                    continue
+                if entry[1] > 1:
+                    self._entries[key] = (future, entry[1] - 1)
+                else:
+                    del self._entries[key]
+                    unwanted.append(future)
+        # Outside the lock: cancelling runs the done callbacks.
+        for future in unwanted:
+            future.cancel()
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is future:
+                del self._entries[key]
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import errno
+import http.client
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from pydantic import ValidationError
+
+from ..auth.manager import get_credential_manager
+from ..models.query import Query
+from ..plugins.registry import UnknownSourceError, available_plugins
+from .cache import ListingCache
+from .executor import execute
+from .scheduler import DownloadScheduler, SharedDownloads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+
+class QueryService:
+    """
+    Warm state shared by every request served by ``rskit serve``.
+
+    The plugin registry, listing cache, download scheduler (with its learned
+    per-host concurrency) and logged-in sessions live for the whole process,
+    so clients only pay for work that is actually new. Concurrent requests
+    for the same granule share one download.
+    """
+
+    def __init__(self, data_dir: str | Path, max_workers: int = 16, listing_ttl: float = 900.0):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.scheduler = DownloadScheduler(max_workers=max_workers)
+        self.downloads = SharedDownloads(self.scheduler)
+        self.cache = ListingCache(ttl=listing_ttl)
+        self.credentials = get_credential_manager()
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def execute(self, query: Query) -> Dict[str, List[str]]:
+        """Run a query and return local file paths per source."""
+        with self._lock:
+            self._requests += 1
+        result = execute(query, self.data_dir, cache=self.cache, downloads=self.downloads)
+        return {source: [str(path) for path in paths] for source, paths in result.items()}
+
+    def status(self) -> Dict[str, Any]:
+        """Health information reported on ``GET /health``."""
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "plugins": available_plugins(),
+            "requests": self._requests,
+            "cached_listings": len(self.cache),
+            "downloads_in_flight": len(self.downloads),
+            "data_dir": str(self.data_dir),
+        }
+
+    def close(self) -> None:
+        """Finish queued downloads and close sessions."""
+        self.scheduler.close()
+        self.credentials.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "rskit"
+
+    @property
+    def service(self) -> QueryService:
+        return self.server.service
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._reply(200, self.service.status())
+        else:
+            self._reply(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/query":
+            self._reply(404, {"error": f"Unknown path {self.path}"})
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            query = Query.model_validate_json(body)
+            self._reply(200, {"files": self.service.execute(query)})
+        except (ValidationError, UnknownSourceError) as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            logger.exception("Query failed")
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: QueryService):
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Unlink a socket left by a dead daemon; refuse to touch anything else."""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "Refusing to replace a file that is not a socket", path)
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+    else:
+        raise OSError(errno.EADDRINUSE, "Another daemon is listening on this socket", path)
+    finally:
+        probe.close()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, service: QueryService):
+        _remove_stale_socket(path)
+        super().__init__(path, _Handler)
+        self.service = service
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def create_server(
+    service: QueryService,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """Bind the daemon to a Unix socket if ``socket_path`` is given, else to ``host:port``."""
+    if socket_path is not None:
+        return _UnixServer(socket_path, service)
+    return _HTTPServer((host, port), service)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class QueryClient:
+    """
+    Client for a running ``rskit serve`` daemon.
+
+    ``address`` is either ``http://host:port`` or ``unix:///path/to/socket``.
+    """
+
+    def __init__(self, address: str = f"http://127.0.0.1:{DEFAULT_PORT}", timeout: Optional[float] = None):
+        self.address = address
+        self.timeout = timeout
+
+    def execute(self, query: Query) -> Dict[str, List[Path]]:
+        """Send a query to the daemon and return local file paths per source."""
+        payload = self._request("POST", "/query", query.model_dump_json().encode())
+        return {source: [Path(p) for p in paths] for source, paths in payload["files"].items()}
+
+    def health(self) -> Dict[str, Any]:
+        """Return the daemon's status."""
+        return self._request("GET", "/health")
+
+    def _connect(self) -> http.client.HTTPConnection:
+        parsed = urlparse(self.address)
+        if parsed.scheme == "unix":
+            return _UnixHTTPConnection(parsed.path, timeout=self.timeout)
+        if parsed.scheme == "http":
+            return http.client.HTTPConnection(parsed.hostname, parsed.port or DEFAULT_PORT, timeout=self.timeout)
+        raise ValueError(f"Unsupported daemon address '{self.address}' (expected http:// or unix://)")
+
+    def _request(self, method: str, path: str, body: Optional[bytes] = None) -> Dict[str, Any]:
+        connection = self._connect()
+        try:
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = json.loads(response.read().decode())
+        finally:
+            connection.close()
+        if response.status == 400:
+            raise ValueError(payload.get("error", "Bad request"))
+        if response.status != 200:
+            raise RuntimeError(payload.get("error", f"Daemon returned HTTP {response.status}"))
+        return payload
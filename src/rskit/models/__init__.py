@@ -5,8 +5,10 @@ This module contains Pydantic models for query validation and data structures.
 """
 
 from .query import Query, SpatialExtent, TemporalExtent
+from .granule import Granule
 
 __all__ = [
+    "Granule",
     "Query",
     "SpatialExtent",
     "TemporalExtent",
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .query import SpatialExtent
+
+
+class Granule(BaseModel):
+    """A single downloadable file advertised by a data source."""
+    id: str = Field(..., description="Identifier unique within the source (e.g., file name)")
+    source: str = Field(..., description="Name of the plugin that advertised the granule")
+    url: str = Field(..., description="Location the granule is downloaded from")
+    size: int = Field(default=0, ge=0, description="Size in bytes, 0 if unknown")
+    start: Optional[datetime] = Field(default=None, description="Start of the time covered")
+    end: Optional[datetime] = Field(default=None, description="End of the time covered")
+    spatial: Optional[SpatialExtent] = Field(default=None, description="Footprint of the granule")
+
+    @property
+    def key(self) -> str:
+        """Key identifying the granule across sources."""
+        return f"{self.source}:{self.id}"
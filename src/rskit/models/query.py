@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, ValidationInfo, Field, field_validator, model_validator
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 class Query(BaseModel):
     """
@@ -21,23 +21,110 @@ class Query(BaseModel):
         """Validate the complete query."""
         if not self.sources:
             raise ValueError("At least one data source must be specified")
+        if self.options.get("memory_limit") is not None:
+            from ..utils.units import parse_size
+            parse_size(self.options["memory_limit"])
         return self
 
 class SpatialExtent(BaseModel):
-    """Spatial bounding box for data queries."""
-    lon_min: float = Field(..., ge=-180, le=180)
-    lon_max: float = Field(..., ge=-180, le=180)
+    """
+    Spatial bounding box for data queries.
+
+    Longitudes may be given in -180..180 or 0..360 and are normalised to
+    -180..180. A box with ``lon_max < lon_min`` after normalisation crosses the
+    antimeridian (e.g., 170 to -170, or 170 to 190 in 0..360 notation).
+    """
+    lon_min: float = Field(..., ge=-180, le=360)
+    lon_max: float = Field(..., ge=-180, le=360)
     lat_min: float = Field(..., ge=-90, le=90)
     lat_max: float = Field(..., ge=-90, le=90)
-    crs: str = Field(default="EPSG:4326", description="Coordinate reference system")
+    crs: str = Field(default="EPSG:4326", description="Coordinate reference system of the requested output")
+    native_bounds: Optional[Tuple[float, float, float, float]] = Field(
+        default=None,
+        description="Requested (xmin, ymin, xmax, ymax) in crs, kept when built with from_bounds",
+    )
 
-    @field_validator('lon_max')
+    @field_validator('crs')
     @classmethod
-    def validate_lon_range(cls, v: float, info: ValidationInfo):
-        """Ensure lon_max >= lon_min."""
-        if 'lon_min' in info.data and v < info.data['lon_min']:
-            raise ValueError(f"lon_max ({v}) must be >= lon_min ({info.data['lon_min']})")
-        return v
+    def validate_crs(cls, v: str) -> str:
+        """Check the CRS is known to PROJ and normalise it to e.g. 'EPSG:3413'."""
+        from ..utils.reproject import normalize_crs
+
+        return normalize_crs(v)
+
+    @model_validator(mode='after')
+    def normalize_lon_range(self):
+        """Map longitudes to -180..180, collapsing boxes spanning 360 degrees to the full globe."""
+        if self.lon_max - self.lon_min >= 360:
+            self.lon_min, self.lon_max = -180.0, 180.0
+            return self
+        lon_min = self.lon_min - 360 if self.lon_min > 180 else self.lon_min
+        lon_max = self.lon_max - 360 if self.lon_max > 180 else self.lon_max
+        if lon_min == 180 and lon_max < lon_min:
+            lon_min = -180.0
+        self.lon_min, self.lon_max = lon_min, lon_max
+        return self
+
+    @classmethod
+    def from_bounds(
+        cls,
+        xmin: float,
+        ymin: float,
+        xmax: float,
+        ymax: float,
+        crs: str,
+        densify: int = 21,
+    ) -> SpatialExtent:
+        """
+        Build an extent from a box in any CRS (e.g., polar stereographic or UTM).
+
+        The box is reprojected to longitude/latitude with densified edges so the
+        geographic extent covers it fully; ``crs`` and the box itself are kept as
+        the output CRS and bounds.
+        """
+        from ..utils.reproject import GEOGRAPHIC_CRS, transform_bounds
+
+        lon_min, lat_min, lon_max, lat_max = transform_bounds((xmin, ymin, xmax, ymax), crs, GEOGRAPHIC_CRS, densify)
+        return cls(
+            lon_min=lon_min,
+            lon_max=lon_max,
+            lat_min=lat_min,
+            lat_max=lat_max,
+            crs=crs,
+            native_bounds=(xmin, ymin, xmax, ymax),
+        )
+
+    def bounds(self, crs: Optional[str] = None, densify: int = 21) -> Tuple[float, float, float, float]:
+        """
+        Return ``(xmin, ymin, xmax, ymax)`` in ``crs`` (defaults to the extent's own CRS).
+
+        The box given to :meth:`from_bounds` is returned as-is for the extent's
+        own CRS; otherwise the geographic box is reprojected.
+        """
+        from ..utils.reproject import GEOGRAPHIC_CRS, normalize_crs, transform_bounds
+
+        crs = normalize_crs(crs) if crs is not None else self.crs
+        if crs == self.crs and self.native_bounds is not None:
+            return self.native_bounds
+        geographic = (self.lon_min, self.lat_min, self.lon_max, self.lat_max)
+        if crs == GEOGRAPHIC_CRS:
+            return geographic
+
+        return transform_bounds(geographic, GEOGRAPHIC_CRS, crs, densify)
+
+    @property
+    def crosses_antimeridian(self) -> bool:
+        """True if the box wraps across the 180th meridian."""
+        return self.lon_max < self.lon_min
+
+    def split(self) -> List[SpatialExtent]:
+        """Return non-wrapping sub-boxes covering this extent (one, or two if it crosses the antimeridian)."""
+        if not self.crosses_antimeridian:
+            return [self]
+        return [
+            self.model_copy(update={"lon_max": 180.0}),
+            self.model_copy(update={"lon_min": -180.0}),
+        ]
 
     @field_validator('lat_max')
     @classmethod
@@ -56,6 +143,8 @@ class TemporalExtent(BaseModel):
     @model_validator(mode='after') # validate after Pydantic performs type coercion
     def validate_temporal_extent(self):
         """Ensure end time is after start time."""
-        if self.start > self.end:
+        from ..utils.dates import as_utc
+
+        if as_utc(self.start) > as_utc(self.end):
             raise ValueError(f"start ({self.start}) must be before end ({self.end})")
         return self
\ No newline at end of file
@@ -3,3 +3,22 @@ Plugin system for RS-Kit.
 
 This module contains plugins for different data sources and processing backends.
 """
+
+from .base import BasePlugin, RateLimit, ThrottledError
+from .registry import UnknownSourceError, available_plugins, get_plugin, register_plugin, unregister_plugin
+from .synthetic import SyntheticConfig, SyntheticPlugin, SyntheticServer, SyntheticServerProcess
+
+__all__ = [
+    "BasePlugin",
+    "RateLimit",
+    "SyntheticConfig",
+    "SyntheticPlugin",
+    "SyntheticServer",
+    "SyntheticServerProcess",
+    "ThrottledError",
+    "UnknownSourceError",
+    "available_plugins",
+    "get_plugin",
+    "register_plugin",
+    "unregister_plugin",
+]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, ClassVar, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from ..auth.manager import CredentialManager, get_credential_manager
+from ..models.granule import Granule
+from ..models.query import Query
+
+
+class ThrottledError(Exception):
+    """Raised by a transfer when the server asked us to slow down (e.g. HTTP 429)."""
+
+    def __init__(self, message: str = "Throttled by server", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimit(BaseModel):
+    """Request limits a data source imposes on clients."""
+    requests_per_second: float = Field(..., gt=0, description="Sustained request rate")
+    burst: int = Field(default=1, ge=1, description="Requests allowed back-to-back before throttling")
+    max_concurrency: Optional[int] = Field(default=None, ge=1, description="Parallel transfers allowed per host")
+
+
+class BasePlugin(ABC):
+    """
+    Base class for data source plugins.
+
+    Subclasses translate a unified Query into source-specific listings and
+    transfers. ``rate_limit`` declares what the source tolerates; the download
+    scheduler honours it.
+    """
+    name: ClassVar[str]
+    rate_limit: ClassVar[Optional[RateLimit]] = None
+
+    @property
+    def credentials(self) -> CredentialManager:
+        """Process-wide credentials, sessions and tokens, shared with every other plugin."""
+        return get_credential_manager()
+
+    @abstractmethod
+    def discover(self, query: Query) -> List[Granule]:
+        """List the granules covering the query's spatial and temporal extent."""
+
+    @abstractmethod
+    def download(self, granule: Granule, dest_dir: Path) -> Path:
+        """Fetch a granule into ``dest_dir`` and return the local path."""
+
+    def open(self, path: Path, variable: str) -> Any:
+        """
+        Decode ``variable`` from a downloaded granule into an array.
+
+        Optional; plugins that only deliver files need not implement it.
+        """
+        raise NotImplementedError(f"Plugin '{self.name}' does not support decoding granules")
+
+    def decoded_size(self, granule: Granule, variable: str) -> Optional[int]:
+        """
+        Estimate the bytes :meth:`open` returns for ``granule``, or None if unknown.
+
+        Optional; lets ``load`` size memory reservations before the first download.
+        """
+        return None
+
+    def grid(self, path: Path) -> Tuple[Any, Any, str]:
+        """
+        Return the 1-D x and y axes and the CRS of a downloaded granule's grid.
+
+        Optional; needed to load data into a query CRS other than EPSG:4326.
+        """
+        raise NotImplementedError(f"Plugin '{self.name}' does not describe granule grids")
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, List
+
+from .base import BasePlugin
+
+
+class UnknownSourceError(ValueError):
+    """Raised when a query names a data source no plugin is registered for."""
+
+
+_plugins: Dict[str, BasePlugin] = {}
+_lock = threading.Lock()
+
+
+def register_plugin(plugin: BasePlugin) -> BasePlugin:
+    """Register a plugin instance under its ``name``, replacing any previous one."""
+    with _lock:
+        _plugins[plugin.name] = plugin
+    return plugin
+
+
+def unregister_plugin(name: str) -> None:
+    """Remove a plugin from the registry if present."""
+    with _lock:
+        _plugins.pop(name, None)
+
+
+def get_plugin(name: str) -> BasePlugin:
+    """Return the registered plugin for a source name."""
+    with _lock:
+        try:
+            return _plugins[name]
+        except KeyError:
+            raise UnknownSourceError(f"Unknown data source '{name}'") from None
+
+
+def available_plugins() -> List[str]:
+    """Names of all registered plugins."""
+    with _lock:
+        return sorted(_plugins)
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from ..models.granule import Granule
+from ..models.query import Query, SpatialExtent
+from ..utils.dates import as_utc
+from ..utils.geo import FootprintIndex
+from .base import BasePlugin, RateLimit, ThrottledError
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _netcdf() -> Any:
+    try:
+        from scipy.io import netcdf_file
+    except ImportError as e:
+        raise ImportError("The synthetic data source requires scipy; install it with 'pip install scipy'") from e
+    return netcdf_file
+
+
+class SyntheticConfig(BaseModel):
+    """Shape of the fake archive served by :class:`SyntheticServer`."""
+    variable: str = Field(default="sea_surface_temperature", description="Variable stored in every granule")
+    start: datetime = Field(default=datetime(2023, 1, 1), description="First day of the archive")
+    days: int = Field(default=30, ge=1, description="Number of daily time steps")
+    tile_degrees: float = Field(default=30.0, gt=0, le=180, description="Edge length of square granule footprints")
+    shape: Tuple[int, int] = Field(default=(180, 360), description="Grid size (lat, lon) of each granule")
+    latency: float = Field(default=0.0, ge=0, description="Seconds added to every server response")
+    failure_rate: float = Field(default=0.0, ge=0, le=1, description="Fraction of requests answered with HTTP 503")
+    seed: int = Field(default=0, description="Seed for injected failures and granule contents")
+    username: Optional[str] = Field(default=None, description="Require HTTP Basic auth with this user for granules and the catalog")
+    password: str = Field(default="", repr=False, description="Password paired with ``username``")
+
+    @property
+    def granule_size(self) -> int:
+        """Approximate size in bytes of one granule file."""
+        ny, nx = self.shape
+        return 4 * (ny * nx + ny + nx) + 8 + 1024
+
+
+def synthetic_catalog(config: SyntheticConfig, base_url: str, source: str = "synthetic") -> List[Granule]:
+    """Every granule of the fake archive: one per day and tile."""
+    granules = []
+    step = config.tile_degrees
+    lats = np.arange(-90.0, 90.0, step)
+    lons = np.arange(-180.0, 180.0, step)
+    for day in range(config.days):
+        start = config.start + timedelta(days=day)
+        for lat in lats:
+            for lon in lons:
+                gid = f"{start:%Y%m%d}_{lon:+07.1f}_{lat:+06.1f}.nc"
+                granules.append(Granule(
+                    id=gid,
+                    source=source,
+                    url=f"{base_url}/granules/{gid}",
+                    size=config.granule_size,
+                    start=start,
+                    end=start + timedelta(days=1) - timedelta(microseconds=1),
+                    spatial=SpatialExtent(
+                        lon_min=lon,
+                        lon_max=min(lon + step, 180.0),
+                        lat_min=lat,
+                        lat_max=min(lat + step, 90.0),
+                    ),
+                ))
+    return granules
+
+
+def _basic_auth(username: str, password: str) -> str:
+    return "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+
+
+def write_granule(path: Path, config: SyntheticConfig, granule: Granule) -> None:
+    """Write a NetCDF-3 file with a smooth field plus noise for ``granule``."""
+    ny, nx = config.shape
+    box = granule.spatial
+    lat = np.linspace(box.lat_min, box.lat_max, ny, dtype=np.float32)
+    lon = np.linspace(box.lon_min, box.lon_max, nx, dtype=np.float32)
+    rng = np.random.default_rng([config.seed, zlib.crc32(granule.id.encode())])
+    field = 15 + 15 * np.cos(np.deg2rad(lat))[:, None] + np.sin(np.deg2rad(lon))[None, :]
+    data = (field + rng.normal(scale=0.5, size=(ny, nx))).astype(np.float32)[None]
+
+    with _netcdf()(str(path), "w") as nc:
+        nc.createDimension("time", 1)
+        nc.createDimension("lat", ny)
+        nc.createDimension("lon", nx)
+        nc.createVariable("time", "f8", ("time",))[:] = (as_utc(granule.start) - _EPOCH).total_seconds()
+        nc.createVariable("lat", "f4", ("lat",))[:] = lat
+        nc.createVariable("lon", "f4", ("lon",))[:] = lon
+        var = nc.createVariable(config.variable, "f4", ("time", "lat", "lon"))
+        var[:] = data
+        var.units = "degC"
+
+
+class SyntheticServer:
+    """
+    Local HTTP server for a fake archive with injectable latency and failures.
+
+    ``GET /catalog.json`` lists all granules and ``GET /granules/<id>`` returns
+    a NetCDF file, generated on first request and cached under ``root``.
+    ``GET /stats`` reports request and failure counts and is never failed.
+    When ``config.username`` is set, other requests without matching HTTP
+    Basic credentials get 401. Use as a context manager to run it in a background thread.
+    """
+
+    def __init__(self, config: Optional[SyntheticConfig] = None, root: Optional[str | Path] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or SyntheticConfig()
+        self._tmp = tempfile.TemporaryDirectory(prefix="rskit-synthetic-") if root is None else None
+        self.root = Path(root if root is not None else self._tmp.name)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.requests = 0
+        self.failures = 0
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._file_locks: Dict[str, threading.Lock] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self.catalog = {g.id: g for g in synthetic_catalog(self.config, self.url)}
+
+    def start(self) -> SyntheticServer:
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and remove generated files if they live in a temporary directory."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+    def __enter__(self) -> SyntheticServer:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < self.config.failure_rate
+            self.failures += fail
+            return fail
+
+    def _authorized(self, header: Optional[str]) -> bool:
+        if self.config.username is None:
+            return True
+        return header == _basic_auth(self.config.username, self.config.password)
+
+    def _granule_path(self, gid: str) -> Path:
+        path = self.root / gid
+        with self._lock:
+            lock = self._file_locks.setdefault(gid, threading.Lock())
+        with lock:
+            if not path.exists():
+                tmp = path.with_suffix(".tmp")
+                write_granule(tmp, self.config, self.catalog[gid])
+                os.replace(tmp, path)
+        return path
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/stats":
+                    body = json.dumps({"requests": server.requests, "failures": server.failures}).encode()
+                    self._send(200, body, "application/json")
+                    return
+                time.sleep(server.config.latency)
+                if not server._authorized(self.headers.get("Authorization")):
+                    self._send(401, b"unauthorized", "text/plain", {"WWW-Authenticate": 'Basic realm="synthetic"'})
+                elif server._should_fail():
+                    self._send(503, b"injected failure", "text/plain", {"Retry-After": "0"})
+                elif self.path == "/catalog.json":
+                    body = json.dumps([g.model_dump(mode="json") for g in server.catalog.values()]).encode()
+                    self._send(200, body, "application/json")
+                elif self.path.startswith("/granules/") and self.path[len("/granules/"):] in server.catalog:
+                    body = server._granule_path(self.path[len("/granules/"):]).read_bytes()
+                    self._send(200, body, "application/x-netcdf")
+                else:
+                    self._send(404, b"not found", "text/plain")
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+class SyntheticServerProcess:
+    """
+    :class:`SyntheticServer` running in a child Python process.
+
+    Keeps the server's CPU time and memory out of measurements taken in the
+    calling process, e.g. by the load test. The child runs
+    ``rskit synthetic`` and exits when its stdin is closed.
+    """
+
+    def __init__(self, config: Optional[SyntheticConfig] = None, root: Optional[str | Path] = None):
+        self.config = config or SyntheticConfig()
+        self.root = root
+        self.url: Optional[str] = None
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self) -> SyntheticServerProcess:
+        """Launch the child and wait until it is listening."""
+        package_root = str(Path(__file__).resolve().parents[2])
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")])))
+        command = [sys.executable, "-m", "rskit", "synthetic", "--config", self.config.model_dump_json()]
+        if self.root is not None:
+            command += ["--root", str(self.root)]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env, text=True)
+        # The child prints its URL once listening; EOF means it failed to start.
+        self.url = self._process.stdout.readline().strip() or None
+        if self.url is None:
+            self.stop()
+            raise RuntimeError("Synthetic server process exited before listening")
+        return self
+
+    def stats(self) -> Dict[str, int]:
+        """Request and failure counts reported by the server."""
+        with urllib.request.urlopen(f"{self.url}/stats", timeout=10) as response:
+            return json.loads(response.read())
+
+    def stop(self) -> None:
+        """Ask the child to exit, killing it if it does not."""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process.stdout.close()
+        self._process = None
+
+    def __enter__(self) -> SyntheticServerProcess:
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+class SyntheticPlugin(BasePlugin):
+    """
+    Data source backed by a :class:`SyntheticServer`, for tests and load testing.
+
+    The catalog is fetched once per plugin instance. Downloads are skipped when
+    the file is already present in the destination directory. Pass ``name`` to
+    register an instance alongside the default ``synthetic`` one. Requests carry
+    HTTP Basic auth when :attr:`credentials` has a login for the server's host.
+    """
+    name: ClassVar[str] = "synthetic"
+
+    def __init__(
+        self,
+        base_url: str,
+        rate_limit: Optional[RateLimit] = None,
+        timeout: float = 30.0,
+        name: Optional[str] = None,
+    ):
+        if name is not None:
+            self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.bytes_downloaded = 0
+        self._index: Optional[FootprintIndex] = None
+        self._lock = threading.Lock()
+
+    def discover(self, query: Query) -> List[Granule]:
+        index = self._catalog()
+        start, end = as_utc(query.temporal.start), as_utc(query.temporal.end)
+        return [g for g in index.query(query.spatial) if as_utc(g.start) <= end and as_utc(g.end) >= start]
+
+    def download(self, granule: Granule, dest_dir: Path) -> Path:
+        path = Path(dest_dir) / granule.id
+        if path.exists():
+            return path
+        body = self._get(granule.url)
+        fd, tmp = tempfile.mkstemp(dir=dest_dir, suffix=".part")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(body)
+        os.replace(tmp, path)
+        with self._lock:
+            self.bytes_downloaded += len(body)
+        return path
+
+    def open(self, path: Path, variable: str) -> np.ndarray:
+        with _netcdf()(str(path), "r", mmap=False) as nc:
+            return nc.variables[variable][:].copy()
+
+    def grid(self, path: Path) -> Tuple[np.ndarray, np.ndarray, str]:
+        with _netcdf()(str(path), "r", mmap=False) as nc:
+            return nc.variables["lon"][:].copy(), nc.variables["lat"][:].copy(), "EPSG:4326"
+
+    def _catalog(self, attempts: int = 5) -> FootprintIndex:
+        with self._lock:
+            for attempt in range(attempts):
+                if self._index is not None:
+                    break
+                try:
+                    entries = json.loads(self._get(f"{self.base_url}/catalog.json"))
+                except ThrottledError:
+                    if attempt == attempts - 1:
+                        raise
+                    continue
+                self._index = FootprintIndex([Granule.model_validate(e) for e in entries])
+            return self._index
+
+    def _get(self, url: str) -> bytes:
+        request = urllib.request.Request(url)
+        creds = self.credentials.credentials(urlparse(url).hostname or "", source=self.name)
+        if creds is not None:
+            request.add_header("Authorization", _basic_auth(creds.username, creds.password))
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as e:
+            if e.code in (429, 503):
+                retry_after = e.headers.get("Retry-After")
+                raise ThrottledError(f"{url}: HTTP {e.code}", retry_after=float(retry_after) if retry_after else None) from e
+            raise
+
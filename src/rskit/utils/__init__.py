@@ -3,3 +3,21 @@ Utility functions for RS-Kit.
 
 This module contains helper functions and utilities used throughout the package.
 """
+
+from .dates import as_utc
+from .geo import FootprintIndex, bbox_intersects
+from .reproject import ResamplingWeights, get_resampling_weights, get_transformer, grid_axes, resample, transform_bounds
+from .units import parse_size
+
+__all__ = [
+    "FootprintIndex",
+    "ResamplingWeights",
+    "as_utc",
+    "bbox_intersects",
+    "get_resampling_weights",
+    "get_transformer",
+    "grid_axes",
+    "parse_size",
+    "resample",
+    "transform_bounds",
+]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Return ``value`` as an aware UTC datetime.
+
+    Naive datetimes are taken to be UTC, so naive catalog times and queries
+    parsed from ISO strings ending in ``Z`` compare without a TypeError.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+from ..models.granule import Granule
+from ..models.query import SpatialExtent
+
+
+def bbox_intersects(
+    extent: SpatialExtent,
+    lon_min: np.ndarray,
+    lon_max: np.ndarray,
+    lat_min: np.ndarray,
+    lat_max: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized test of which footprints intersect ``extent``.
+
+    Footprint arrays use -180..180 longitudes and may themselves cross the
+    antimeridian (``lon_max < lon_min``). Returns a boolean mask.
+    """
+    lon_min = np.asarray(lon_min, dtype=float)
+    lon_max = np.asarray(lon_max, dtype=float)
+    lat_ok = (np.asarray(lat_min, dtype=float) <= extent.lat_max) & (extent.lat_min <= np.asarray(lat_max, dtype=float))
+
+    wraps = lon_max < lon_min
+    if not extent.crosses_antimeridian and not wraps.any():
+        # Fast path: plain interval overlap, no wrapping on either side.
+        return lat_ok & (lon_min <= extent.lon_max) & (extent.lon_min <= lon_max)
+
+    lon_ok = np.zeros(lon_min.shape, dtype=bool)
+    for box in extent.split():
+        plain = (lon_min <= box.lon_max) & (box.lon_min <= lon_max)
+        # A wrapping footprint is [lon_min, 180] U [-180, lon_max].
+        wrapped = (lon_min <= box.lon_max) | (box.lon_min <= lon_max)
+        lon_ok |= np.where(wraps, wrapped, plain)
+    return lat_ok & lon_ok
+
+
+class FootprintIndex:
+    """
+    Footprints of a set of granules stored as arrays for vectorized spatial filtering.
+
+    Granules without a footprint are always returned, since they cannot be ruled out.
+    """
+
+    def __init__(self, granules: Sequence[Granule]):
+        self.granules = list(granules)
+        located = [g.spatial for g in self.granules]
+        self._has_footprint = np.array([s is not None for s in located], dtype=bool)
+        self._bounds = np.array(
+            [(s.lon_min, s.lon_max, s.lat_min, s.lat_max) if s is not None else (0.0, 0.0, 0.0, 0.0) for s in located],
+            dtype=float,
+        ).reshape(-1, 4)
+
+    def __len__(self) -> int:
+        return len(self.granules)
+
+    def mask(self, extent: SpatialExtent) -> np.ndarray:
+        """Boolean mask of granules that may intersect ``extent``."""
+        hits = bbox_intersects(extent, *self._bounds.T)
+        return hits | ~self._has_footprint
+
+    def query(self, extent: SpatialExtent) -> List[Granule]:
+        """Granules that may intersect ``extent``, in index order."""
+        return [self.granules[i] for i in np.flatnonzero(self.mask(extent))]
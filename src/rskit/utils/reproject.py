@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Tuple
+
+import numpy as np
+
+GEOGRAPHIC_CRS = "EPSG:4326"
+
+
+def _pyproj() -> Any:
+    try:
+        import pyproj
+    except ImportError as e:
+        raise ImportError("Reprojection requires pyproj; install it with 'pip install pyproj'") from e
+    return pyproj
+
+
+@lru_cache(maxsize=64)
+def get_transformer(src_crs: str, dst_crs: str) -> Any:
+    """
+    Return a cached ``pyproj.Transformer`` between two CRSs.
+
+    Axis order is always (x, y) / (lon, lat). Building a transformer is far
+    more expensive than using one, so they are shared across granules.
+    """
+    return _pyproj().Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+
+
+@lru_cache(maxsize=64)
+def normalize_crs(crs: str) -> str:
+    """
+    Return the canonical ``AUTHORITY:CODE`` form of ``crs``, e.g. ``"epsg:4326"`` to ``"EPSG:4326"``.
+
+    CRSs without an authority code are returned as WKT. Raises ValueError for
+    anything PROJ cannot parse. EPSG:4326 is recognised without pyproj.
+    """
+    if crs.strip().upper() == GEOGRAPHIC_CRS:
+        return GEOGRAPHIC_CRS
+    pyproj = _pyproj()
+    try:
+        parsed = pyproj.CRS.from_user_input(crs)
+    except pyproj.exceptions.CRSError as e:
+        raise ValueError(f"Invalid CRS '{crs}': {e}") from e
+    authority = parsed.to_authority()
+    return ":".join(authority) if authority else parsed.to_wkt()
+
+
+@lru_cache(maxsize=64)
+def is_geographic(crs: str) -> bool:
+    """True if ``crs`` uses longitude/latitude coordinates."""
+    if crs == GEOGRAPHIC_CRS:
+        return True
+    return bool(_pyproj().CRS.from_user_input(crs).is_geographic)
+
+
+def transform_bounds(
+    bounds: Tuple[float, float, float, float],
+    src_crs: str,
+    dst_crs: str,
+    densify: int = 21,
+) -> Tuple[float, float, float, float]:
+    """
+    Reproject ``(xmin, ymin, xmax, ymax)`` with ``densify`` points per edge.
+
+    Densifying catches the curvature of box edges in the target CRS. Boxes
+    containing a pole or crossing the antimeridian are handled by PROJ; in the
+    latter case the returned xmin is greater than xmax.
+    """
+    if src_crs == dst_crs:
+        return bounds
+    return tuple(get_transformer(src_crs, dst_crs).transform_bounds(*bounds, densify_pts=densify))
+
+
+def grid_axes(bounds: Tuple[float, float, float, float], resolution: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cell-centre x and y axes of a north-up grid covering ``(xmin, ymin, xmax, ymax)``.
+
+    The y axis runs from north to south, as in most raster formats.
+    """
+    if resolution <= 0:
+        raise ValueError(f"resolution must be positive, got {resolution}")
+    xmin, ymin, xmax, ymax = bounds
+    # Round first so bounds that went through a reprojection round trip do not gain a cell.
+    nx = max(int(np.ceil(round((xmax - xmin) / resolution, 6))), 1)
+    ny = max(int(np.ceil(round((ymax - ymin) / resolution, 6))), 1)
+    x = xmin + (np.arange(nx) + 0.5) * resolution
+    y = ymax - (np.arange(ny) + 0.5) * resolution
+    return x, y
+
+
+def _fractional_index(axis: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    """Fractional position of ``coords`` along a monotonic 1-D ``axis``; NaN outside it."""
+    index = np.arange(axis.size, dtype=float)
+    if axis.size > 1 and axis[0] > axis[-1]:
+        axis, index = axis[::-1], index[::-1]
+    return np.interp(coords, axis, index, left=np.nan, right=np.nan)
+
+
+class ResamplingWeights:
+    """
+    Precomputed sparse weights mapping a source grid onto a target grid.
+
+    Each target cell is a weighted sum of up to four source cells. Applying the
+    weights is a gather and a multiply, so reusing them across granules on the
+    same grid skips all coordinate transformation.
+    """
+
+    def __init__(self, indices: np.ndarray, weights: np.ndarray, src_shape: Tuple[int, int], dst_shape: Tuple[int, int]):
+        self.indices = indices
+        self.weights = weights
+        self.src_shape = src_shape
+        self.dst_shape = dst_shape
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the weights."""
+        return self.indices.nbytes + self.weights.nbytes
+
+    def work_bytes(self, leading: Tuple[int, ...] = ()) -> int:
+        """Approximate temporary memory :meth:`apply` needs for data with leading dimensions ``leading``."""
+        count = int(np.prod(leading, dtype=np.int64))
+        # Gathered values, masked weights and their product, plus the float result.
+        return count * (3 * self.weights.size + int(np.prod(self.dst_shape))) * 8
+
+    def apply(self, data: np.ndarray) -> np.ndarray:
+        """Resample ``data`` of shape ``(..., ny, nx)`` onto the target grid."""
+        data = np.asarray(data)
+        if data.shape[-2:] != self.src_shape:
+            raise ValueError(f"data grid {data.shape[-2:]} does not match source grid {self.src_shape}")
+        flat = data.reshape(data.shape[:-2] + (-1,)).astype(float, copy=False)
+        gathered = flat[..., self.indices]
+        valid = ~np.isnan(gathered)
+        weights = np.where(valid, self.weights, 0.0)
+        total = weights.sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out = (np.where(valid, gathered, 0.0) * weights).sum(axis=-1) / total
+        out[total == 0] = np.nan
+        return out.reshape(data.shape[:-2] + self.dst_shape)
+
+
+def _compute_weights(
+    src_x: np.ndarray,
+    src_y: np.ndarray,
+    src_crs: str,
+    dst_x: np.ndarray,
+    dst_y: np.ndarray,
+    dst_crs: str,
+    method: str,
+) -> ResamplingWeights:
+    xx, yy = np.meshgrid(dst_x, dst_y)
+    if src_crs != dst_crs:
+        xx, yy = get_transformer(dst_crs, src_crs).transform(xx, yy)
+        xx, yy = np.asarray(xx), np.asarray(yy)
+    if is_geographic(src_crs):
+        # Bring longitudes into the source grid's convention (-180..180 or 0..360).
+        x0 = float(src_x.min())
+        xx = (xx - x0) % 360 + x0
+
+    fx = _fractional_index(src_x, xx.ravel())
+    fy = _fractional_index(src_y, yy.ravel())
+    nx = src_x.size
+    outside = np.isnan(fx) | np.isnan(fy)
+    fx = np.where(outside, 0.0, fx)
+    fy = np.where(outside, 0.0, fy)
+
+    if method == "nearest":
+        ix, iy = np.rint(fx).astype(int), np.rint(fy).astype(int)
+        indices = (iy * nx + ix)[:, None]
+        weights = (~outside).astype(float)[:, None]
+    elif method == "bilinear":
+        ix0 = np.minimum(np.floor(fx).astype(int), max(nx - 2, 0))
+        iy0 = np.minimum(np.floor(fy).astype(int), max(src_y.size - 2, 0))
+        ix1 = np.minimum(ix0 + 1, nx - 1)
+        iy1 = np.minimum(iy0 + 1, src_y.size - 1)
+        wx, wy = fx - ix0, fy - iy0
+        indices = np.stack([iy0 * nx + ix0, iy0 * nx + ix1, iy1 * nx + ix0, iy1 * nx + ix1], axis=-1)
+        weights = np.stack([(1 - wx) * (1 - wy), wx * (1 - wy), (1 - wx) * wy, wx * wy], axis=-1)
+        weights[outside] = 0.0
+    else:
+        raise ValueError(f"Unknown resampling method '{method}' (expected 'nearest' or 'bilinear')")
+
+    return ResamplingWeights(indices, weights, (src_y.size, nx), (dst_y.size, dst_x.size))
+
+
+_weights_cache: "OrderedDict[str, ResamplingWeights]" = OrderedDict()
+_weights_lock = threading.Lock()
+WEIGHTS_CACHE_SIZE = 16
+
+
+def _grid_key(*parts: Any) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(str(part.shape).encode())
+            digest.update(np.ascontiguousarray(part, dtype=float).tobytes())
+        else:
+            digest.update(str(part).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+def get_resampling_weights(
+    src_x: Any,
+    src_y: Any,
+    src_crs: str,
+    dst_x: Any,
+    dst_y: Any,
+    dst_crs: str,
+    method: str = "bilinear",
+) -> ResamplingWeights:
+    """
+    Return cached weights mapping a regular source grid onto a target grid.
+
+    Grids are given by their 1-D x and y axes in their own CRS. Weights are
+    keyed by the grid coordinates, so every granule on the same grids reuses them.
+    """
+    src_x, src_y = np.asarray(src_x, dtype=float), np.asarray(src_y, dtype=float)
+    dst_x, dst_y = np.asarray(dst_x, dtype=float), np.asarray(dst_y, dtype=float)
+    key = _grid_key(src_x, src_y, src_crs, dst_x, dst_y, dst_crs, method)
+    with _weights_lock:
+        weights = _weights_cache.get(key)
+        if weights is not None:
+            _weights_cache.move_to_end(key)
+            return weights
+
+    weights = _compute_weights(src_x, src_y, src_crs, dst_x, dst_y, dst_crs, method)
+    with _weights_lock:
+        _weights_cache[key] = weights
+        while len(_weights_cache) > WEIGHTS_CACHE_SIZE:
+            _weights_cache.popitem(last=False)
+    return weights
+
+
+def resample(
+    data: Any,
+    src_x: Any,
+    src_y: Any,
+    src_crs: str,
+    dst_x: Any,
+    dst_y: Any,
+    dst_crs: str,
+    method: str = "bilinear",
+) -> np.ndarray:
+    """Resample ``data`` of shape ``(..., ny, nx)`` from the source grid onto the target grid."""
+    return get_resampling_weights(src_x, src_y, src_crs, dst_x, dst_y, dst_crs, method).apply(data)
+
+
+def clear_caches() -> None:
+    """Drop cached transformers and resampling weights."""
+    get_transformer.cache_clear()
+    is_geographic.cache_clear()
+    normalize_crs.cache_clear()
+    with _weights_lock:
+        _weights_cache.clear()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import re
+
+_UNITS = {
+    "": 1,
+    "B": 1,
+    "KB": 10**3,
+    "MB": 10**6,
+    "GB": 10**9,
+    "TB": 10**12,
+    "KIB": 2**10,
+    "MIB": 2**20,
+    "GIB": 2**30,
+    "TIB": 2**40,
+}
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([A-Za-z]*)\s*$")
+
+
+def parse_size(value: int | float | str) -> int:
+    """
+    Parse a byte count such as ``"8GB"``, ``"512 MiB"`` or ``1048576``.
+
+    Decimal (KB, MB, GB, TB) and binary (KiB, MiB, GiB, TiB) suffixes are accepted.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid size: {value!r}")
+    if isinstance(value, (int, float)):
+        if value <= 0:
+            raise ValueError(f"Size must be positive, got {value}")
+        return int(value)
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid size {value!r} (expected a number or a string such as '8GB')")
+
+    match = _SIZE_RE.match(value)
+    if match is None or match.group(2).upper() not in _UNITS:
+        raise ValueError(f"Invalid size '{value}' (expected e.g. '8GB' or '512MiB')")
+    size = int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+    if size <= 0:
+        raise ValueError(f"Size must be positive, got '{value}'")
+    return size
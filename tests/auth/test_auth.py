@@ -0,0 +1,328 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from rskit.auth import CredentialManager, Credentials, SessionPool, Token, TokenCache, fetch_token, load_credentials
+
+
+@pytest.fixture
+def auth_server():
+    """Local mock OAuth2 token endpoint that counts logins."""
+    state = {"logins": 0, "expires_in": 3600, "auth": None}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            state["logins"] += 1
+            state["auth"] = self.headers.get("Authorization")
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            body = json.dumps({
+                "access_token": f"token-{state['logins']}",
+                "token_type": "bearer",
+                "expires_in": state["expires_in"],
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/token"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _token(value: str, seconds: float) -> Token:
+    return Token(access_token=value, expires_at=datetime.now(timezone.utc) + timedelta(seconds=seconds))
+
+
+class TestLoadCredentials:
+    """Test cases for load_credentials."""
+
+    def test_load_credentials_from_netrc(self, tmp_path):
+        """Test credentials are read from a netrc file."""
+        # Arrange
+        netrc_file = tmp_path / "netrc"
+        netrc_file.write_text("machine data.example.org login alice password s3cret\n")
+
+        # Act
+        creds = load_credentials("data.example.org", netrc_path=netrc_file, env={})
+
+        # Assert
+        assert creds.username == "alice"
+        assert creds.password == "s3cret"
+
+    def test_load_credentials_env_overrides_netrc(self, tmp_path):
+        """Test source environment variables take precedence over netrc."""
+        # Arrange
+        netrc_file = tmp_path / "netrc"
+        netrc_file.write_text("machine data.example.org login alice password s3cret\n")
+        env = {"RSKIT_AVISO_USERNAME": "bob", "RSKIT_AVISO_PASSWORD": "hunter2"}
+
+        # Act
+        creds = load_credentials("data.example.org", source="aviso", netrc_path=netrc_file, env=env)
+
+        # Assert
+        assert creds.username == "bob"
+        assert creds.password == "hunter2"
+
+    def test_load_credentials_missing(self, tmp_path):
+        """Test None is returned when nothing is configured."""
+        # Act
+        creds = load_credentials("data.example.org", netrc_path=tmp_path / "absent", env={})
+
+        # Assert
+        assert creds is None
+
+
+class TestTokenCache:
+    """Test cases for TokenCache and fetch_token."""
+
+    def test_fetch_token_from_mock_endpoint(self, auth_server):
+        """Test a token is obtained with basic auth from the endpoint."""
+        # Arrange
+        creds = Credentials(host="127.0.0.1", username="alice", password="s3cret")
+
+        # Act
+        token = fetch_token(auth_server["url"], creds)
+
+        # Assert
+        assert token.access_token == "token-1"
+        assert token.authorization_header == "Bearer token-1"
+        assert auth_server["auth"].startswith("Basic ")
+        assert not token.expires_within(3000)
+
+    def test_token_reused_until_refresh_margin(self):
+        """Test a fresh token is returned from cache without refetching."""
+        # Arrange
+        cache = TokenCache(refresh_margin=60)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return _token(f"t{len(calls)}", 3600)
+
+        # Act
+        first = cache.get("host", fetch)
+        second = cache.get("host", fetch)
+
+        # Assert
+        assert first.access_token == second.access_token == "t1"
+        assert len(calls) == 1
+
+    def test_token_refreshed_ahead_of_expiry(self):
+        """Test a token inside the refresh margin is replaced."""
+        # Arrange
+        cache = TokenCache(refresh_margin=60)
+        tokens = iter([_token("old", 30), _token("new", 3600)])
+
+        # Act
+        cache.get("host", lambda: next(tokens))
+        refreshed = cache.get("host", lambda: next(tokens))
+
+        # Assert
+        assert refreshed.access_token == "new"
+
+    def test_stale_token_kept_when_refresh_fails(self):
+        """Test a still-valid token is returned if the early refresh fails."""
+        # Arrange
+        cache = TokenCache(refresh_margin=60)
+        cache.get("host", lambda: _token("old", 30))
+
+        def failing():
+            raise ConnectionError("portal down")
+
+        # Act
+        token = cache.get("host", failing)
+
+        # Assert
+        assert token.access_token == "old"
+
+    def test_concurrent_callers_login_once(self):
+        """Test many threads share a single login."""
+        # Arrange
+        cache = TokenCache()
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def fetch():
+            calls.append(1)
+            return _token("shared", 3600)
+
+        def worker():
+            barrier.wait()
+            cache.get("host", fetch)
+
+        # Act
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Assert
+        assert len(calls) == 1
+
+    def test_disk_cache_shared_between_instances(self, tmp_path):
+        """Test a token persisted by one cache is reused by another."""
+        # Arrange
+        first = TokenCache(cache_dir=tmp_path)
+        second = TokenCache(cache_dir=tmp_path)
+        first.get("host", lambda: _token("persisted", 3600))
+
+        # Act
+        token = second.get("host", lambda: pytest.fail("should not log in again"))
+
+        # Assert
+        assert token.access_token == "persisted"
+
+    def test_invalidate_forces_new_login(self, tmp_path):
+        """Test invalidate drops memory and disk copies."""
+        # Arrange
+        cache = TokenCache(cache_dir=tmp_path)
+        cache.get("host", lambda: _token("revoked", 3600))
+
+        # Act
+        cache.invalidate("host")
+        token = cache.get("host", lambda: _token("fresh", 3600))
+
+        # Assert
+        assert token.access_token == "fresh"
+
+
+class TestCredentialManager:
+    """Test cases for CredentialManager."""
+
+    def test_get_token_logs_in_once(self, auth_server, tmp_path):
+        """Test tokens from the mock endpoint are cached per host."""
+        # Arrange
+        netrc_file = tmp_path / "netrc"
+        netrc_file.write_text("machine 127.0.0.1 login alice password s3cret\n")
+        manager = CredentialManager(netrc_path=netrc_file)
+
+        # Act
+        first = manager.get_token("127.0.0.1", auth_server["url"])
+        second = manager.get_token("127.0.0.1", auth_server["url"])
+
+        # Assert
+        assert first.access_token == second.access_token
+        assert auth_server["logins"] == 1
+
+    def test_get_token_without_credentials_raises(self, auth_server, tmp_path):
+        """Test a clear error is raised when no credentials exist."""
+        # Arrange
+        manager = CredentialManager(netrc_path=tmp_path / "absent")
+
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            manager.get_token("127.0.0.1", auth_server["url"])
+
+        assert "No credentials configured" in str(exc_info.value)
+
+    def test_missing_credentials_not_cached(self, tmp_path):
+        """Test credentials added after a miss are found on the next lookup."""
+        # Arrange
+        netrc_file = tmp_path / "netrc"
+        manager = CredentialManager(netrc_path=netrc_file)
+        missing = manager.credentials("data.example.org")
+
+        # Act
+        netrc_file.write_text("machine data.example.org login alice password s3cret\n")
+        found = manager.credentials("data.example.org")
+
+        # Assert
+        assert missing is None
+        assert found.username == "alice"
+
+    def test_get_session_reuses_login(self, tmp_path):
+        """Test sessions are created once and closed on drop."""
+        # Arrange
+        manager = CredentialManager(netrc_path=tmp_path / "absent")
+        created = []
+
+        class FakeSession:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        def login(creds):
+            created.append(creds)
+            return FakeSession()
+
+        # Act
+        first = manager.get_session("ftp.example.org", login)
+        second = manager.get_session("ftp.example.org", login)
+        manager.drop_session("ftp.example.org")
+
+        # Assert
+        assert first is second
+        assert created == [None]
+        assert first.closed
+
+    def test_connection_pool_reuses_and_bounds_connections(self, tmp_path):
+        """Test pooled connections are exclusive, reused and capped per host."""
+        # Arrange
+        manager = CredentialManager(netrc_path=tmp_path / "absent", pool_size=2)
+        logins = []
+        in_use, peak = set(), [0]
+        lock = threading.Lock()
+
+        def login(creds):
+            logins.append(object())
+            return logins[-1]
+
+        def worker():
+            for _ in range(5):
+                with manager.connection("ftp.example.org", login) as conn:
+                    with lock:
+                        assert conn not in in_use
+                        in_use.add(conn)
+                        peak[0] = max(peak[0], len(in_use))
+                    with lock:
+                        in_use.discard(conn)
+
+        # Act
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Assert
+        assert 1 <= len(logins) <= 2
+        assert peak[0] <= 2
+
+
+class TestSessionPool:
+    """Test cases for SessionPool."""
+
+    def test_failed_connection_not_returned(self):
+        """Test a connection that raised is closed rather than reused."""
+        # Arrange
+        class Conn:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        pool = SessionPool(Conn, max_size=1)
+
+        # Act
+        with pytest.raises(ConnectionError):
+            with pool.connection() as first:
+                raise ConnectionError("reset")
+        with pool.connection() as second:
+            pass
+
+        # Assert
+        assert first.closed
+        assert second is not first
@@ -0,0 +1,16 @@
+import pytest
+from rskit.plugins.registry import register_plugin, unregister_plugin
+
+
+@pytest.fixture
+def register():
+    """Register fake plugins for one test; they are unregistered afterwards."""
+    names = []
+
+    def _register(plugin):
+        names.append(register_plugin(plugin).name)
+        return plugin
+
+    yield _register
+    for name in names:
+        unregister_plugin(name)
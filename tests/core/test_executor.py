@@ -0,0 +1,300 @@
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from rskit.core.executor import discover, execute, execute_many
+from rskit.models.granule import Granule
+from rskit.models.query import Query, SpatialExtent, TemporalExtent
+from rskit.plugins.base import BasePlugin
+
+
+class TileSource(BasePlugin):
+    """Fake source with 10-degree tiles around the dateline."""
+    name = "tiles"
+
+    def __init__(self):
+        self.discover_calls = []
+        self.downloads = []
+        self.tiles = [
+            Granule(
+                id=f"tile_{lon}.nc",
+                source=self.name,
+                url=f"https://tiles.example.org/tile_{lon}.nc",
+                spatial=SpatialExtent(lon_min=lon, lon_max=lon + 10, lat_min=-10.0, lat_max=10.0),
+            )
+            for lon in (150, 160, 170, -180, -170, -160)
+        ]
+        self.tiles.insert(3, Granule(id="global.nc", source=self.name, url="https://tiles.example.org/global.nc"))
+
+    def discover(self, query):
+        self.discover_calls.append(query.spatial)
+        assert not query.spatial.crosses_antimeridian
+        return self.tiles
+
+    def download(self, granule, dest_dir):
+        self.downloads.append(granule.id)
+        return Path(dest_dir) / granule.id
+
+
+class DailySource(BasePlugin):
+    """Fake source with one granule per day and hemisphere."""
+    name = "daily"
+
+    def __init__(self):
+        self.discover_calls = 0
+        self.downloads = []
+        self.granules = [
+            Granule(
+                id=f"{day:02d}_{side}.nc",
+                source=self.name,
+                url=f"https://daily.example.org/{day:02d}_{side}.nc",
+                start=datetime(2023, 1, day),
+                end=datetime(2023, 1, day, 23, 59),
+                spatial=SpatialExtent(lon_min=lon, lon_max=lon + 180, lat_min=-90.0, lat_max=90.0),
+            )
+            for day in range(1, 4)
+            for side, lon in (("west", -180.0), ("east", 0.0))
+        ]
+
+    def discover(self, query):
+        self.discover_calls += 1
+        return self.granules
+
+    def download(self, granule, dest_dir):
+        self.downloads.append(granule.id)
+        return Path(dest_dir) / granule.id
+
+
+class BrokenSource(BasePlugin):
+    """Fake source whose first granule fails to download and the rest are slow."""
+    name = "broken"
+
+    def __init__(self):
+        self.downloads = []
+        self.granules = [
+            Granule(id=f"{i:02d}.nc", source=self.name, url=f"https://broken.example.org/{i:02d}.nc")
+            for i in range(20)
+        ]
+
+    def discover(self, query):
+        return self.granules
+
+    def download(self, granule, dest_dir):
+        self.downloads.append(granule.id)
+        if granule.id == "00.nc":
+            raise ValueError("corrupt granule")
+        time.sleep(0.1)
+        return Path(dest_dir) / granule.id
+
+
+@pytest.fixture
+def broken(register):
+    return register(BrokenSource())
+
+
+@pytest.fixture
+def daily(register):
+    return register(DailySource())
+
+
+@pytest.fixture
+def tiles(register):
+    return register(TileSource())
+
+
+def _point_query(lon, lat, day):
+    """Small query on ``daily`` around ``(lon, lat)`` during one day."""
+    return Query(
+        variable="sst",
+        spatial=SpatialExtent(lon_min=lon, lon_max=lon + 0.1, lat_min=lat, lat_max=lat + 0.1),
+        temporal=TemporalExtent(start=datetime(2023, 1, day, 6), end=datetime(2023, 1, day, 18)),
+        sources=["daily"],
+    )
+
+
+def _tile_query(lon_min, lon_max):
+    """Query on ``tiles`` over a longitude range for January."""
+    return Query(
+        variable="sla",
+        spatial=SpatialExtent(lon_min=lon_min, lon_max=lon_max, lat_min=-5.0, lat_max=5.0),
+        temporal=TemporalExtent(start=datetime(2023, 1, 1), end=datetime(2023, 1, 31)),
+        sources=["tiles"],
+    )
+
+
+class TestDiscover:
+    """Test cases for discover."""
+
+    def test_plain_query_single_call(self, tiles):
+        """Test a non-crossing query is passed straight to the plugin."""
+        # Act
+        granules = discover(_tile_query(152.0, 158.0), tiles)
+
+        # Assert
+        assert len(tiles.discover_calls) == 1
+        assert [g.id for g in granules] == ["tile_150.nc", "global.nc"]
+
+    def test_crossing_query_split_and_deduplicated(self, tiles):
+        """Test a dateline query is split, and shared granules appear once."""
+        # Act
+        granules = discover(_tile_query(175.0, -175.0), tiles)
+
+        # Assert
+        assert len(tiles.discover_calls) == 2
+        assert [g.id for g in granules] == ["tile_170.nc", "global.nc", "tile_-180.nc"]
+
+
+    def test_timezone_aware_query_against_naive_catalog(self, daily):
+        """Test aware query times compare against naive granule times as UTC."""
+        # Arrange
+        query = Query.model_validate_json(
+            '{"variable": "sst", "sources": ["daily"],'
+            ' "spatial": {"lon_min": 10, "lon_max": 11, "lat_min": 0, "lat_max": 1},'
+            ' "temporal": {"start": "2023-01-02T06:00:00Z", "end": "2023-01-02T18:00:00Z"}}'
+        )
+
+        # Act
+        granules = discover(query, daily)
+
+        # Assert
+        assert [g.id for g in granules] == ["02_east.nc"]
+
+
+class TestExecute:
+    """Test cases for execute."""
+
+    def test_crossing_query_downloads_each_granule_once(self, tiles, tmp_path):
+        """Test both halves of a dateline query are fetched once and merged."""
+        # Act
+        result = execute(_tile_query(175.0, 185.0), tmp_path)
+
+        # Assert
+        assert sorted(tiles.downloads) == ["global.nc", "tile_-180.nc", "tile_170.nc"]
+        assert sorted(result["tiles"]) == sorted(tmp_path / name for name in tiles.downloads)
+
+    def test_unknown_source_raises(self, tmp_path):
+        """Test querying an unregistered source fails clearly."""
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            execute(_tile_query(0.0, 10.0).model_copy(update={"sources": ["nowhere"]}), tmp_path)
+
+        assert "Unknown data source 'nowhere'" in str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        "run", [execute, lambda query, dest_dir: execute_many([query], dest_dir)], ids=["execute", "execute_many"],
+    )
+    def test_failure_cancels_queued_downloads(self, broken, tmp_path, run):
+        """Test a failed download cancels the rest instead of waiting for them on close."""
+        # Act
+        with pytest.raises(ValueError, match="corrupt granule"):
+            run(_tile_query(0.0, 10.0).model_copy(update={"sources": ["broken"]}), tmp_path)
+
+        # Assert
+        assert len(broken.downloads) < len(broken.granules) // 2
+
+
+class TestExecuteMany:
+    """Test cases for execute_many."""
+
+    def test_batch_discovers_once_and_downloads_unique_granules(self, daily, tmp_path):
+        """Test many nearby queries share one listing and one download per granule."""
+        # Arrange
+        queries = [_point_query(10.0 + i * 0.01, 5.0, 1) for i in range(50)] + [_point_query(-60.0, 0.0, 2)]
+
+        # Act
+        results = execute_many(queries, tmp_path)
+
+        # Assert
+        # One listing for the 50 clustered points and one for the lone query on day 2.
+        assert daily.discover_calls == 2
+        assert sorted(daily.downloads) == ["01_east.nc", "02_west.nc"]
+        assert results[0] == {"daily": [tmp_path / "01_east.nc"]}
+        assert results[-1] == {"daily": [tmp_path / "02_west.nc"]}
+
+    def test_results_match_individual_execution(self, daily, tmp_path):
+        """Test batch results equal running each query on its own."""
+        # Arrange
+        queries = [_point_query(-100.0, 10.0, 3), _point_query(100.0, -10.0, 1), _point_query(170.0, 0.0, 2)]
+
+        # Act
+        batch = execute_many(queries, tmp_path)
+        single = [execute(q, tmp_path) for q in queries]
+
+        # Assert
+        assert batch == single
+
+    def test_groups_by_source_and_variable(self, daily, tiles, tmp_path):
+        """Test queries for different sources or variables are discovered separately."""
+        # Arrange
+        sst = _point_query(10.0, 5.0, 1)
+        sla = sst.model_copy(update={"variable": "sla"})
+        both = sst.model_copy(update={"sources": ["daily", "tiles"], "spatial": SpatialExtent(
+            lon_min=175.0, lon_max=-175.0, lat_min=-5.0, lat_max=5.0,
+        )})
+
+        # Act
+        results = execute_many([sst, sla, both], tmp_path)
+
+        # Assert
+        # The sst group holds two distant clusters, and the crossing one is listed in two halves.
+        assert daily.discover_calls == 4
+        assert set(results[2]) == {"daily", "tiles"}
+        assert sorted(p.name for p in results[2]["daily"]) == ["01_east.nc", "01_west.nc"]
+        assert daily.downloads.count("01_east.nc") == 1
+
+    def test_crossing_batch_keeps_wrapping_envelope(self, tiles, tmp_path):
+        """Test a batch near the dateline is discovered over the narrow wrapping box."""
+        # Arrange
+        queries = [_tile_query(172.0, 178.0), _tile_query(175.0, -175.0), _tile_query(-178.0, -172.0)]
+
+        # Act
+        results = execute_many(queries, tmp_path)
+
+        # Assert
+        spans = sorted((box.lon_min, box.lon_max) for box in tiles.discover_calls)
+        assert spans == [(-180.0, -172.0), (172.0, 180.0)]
+        assert results == [execute(q, tmp_path) for q in queries]
+
+    def test_distant_members_listed_separately(self, daily, tmp_path):
+        """Test queries far apart in time or space are not listed over one covering envelope."""
+        # Arrange
+        queries = [_point_query(10.0, 5.0, 1), _point_query(10.0, 5.0, 3), _point_query(-100.0, -40.0, 1)]
+
+        # Act
+        results = execute_many(queries, tmp_path)
+
+        # Assert
+        assert daily.discover_calls == 3
+        assert results == [execute(q, tmp_path) for q in queries]
+
+    def test_options_order_does_not_split_groups(self, daily, tmp_path):
+        """Test queries whose options differ only in key order share a group."""
+        # Arrange
+        first = _point_query(10.0, 5.0, 1).model_copy(update={"options": {"a": 1, "b": 2}})
+        second = _point_query(10.05, 5.0, 1).model_copy(update={"options": {"b": 2, "a": 1}})
+
+        # Act
+        execute_many([first, second], tmp_path)
+
+        # Assert
+        assert daily.discover_calls == 1
+
+    def test_mixed_timezones_in_batch(self, daily, tmp_path):
+        """Test naive and aware queries can be batched together."""
+        # Arrange
+        naive = _point_query(10.0, 5.0, 1)
+        aware = _point_query(-60.0, 0.0, 2).model_copy(update={"temporal": TemporalExtent(
+            start=datetime(2023, 1, 2, 6, tzinfo=timezone.utc), end=datetime(2023, 1, 2, 18, tzinfo=timezone.utc),
+        )})
+
+        # Act
+        results = execute_many([naive, aware], tmp_path)
+
+        # Assert
+        assert results == [{"daily": [tmp_path / "01_east.nc"]}, {"daily": [tmp_path / "02_west.nc"]}]
+
+    def test_empty_batch(self, tmp_path):
+        """Test an empty batch returns no results."""
+        # Act & Assert
+        assert execute_many([], tmp_path) == []
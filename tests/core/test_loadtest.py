@@ -0,0 +1,63 @@
+from rskit.core.loadtest import random_queries, run_load_test
+from rskit.plugins.registry import available_plugins, get_plugin
+from rskit.plugins.synthetic import SyntheticConfig, SyntheticPlugin
+
+
+class TestLoadTest:
+    """Test cases for the load test driver."""
+
+    def test_random_queries_inside_archive(self):
+        """Test generated queries fall within the archive's extent and time range."""
+        # Arrange
+        config = SyntheticConfig(days=5)
+
+        # Act
+        queries = random_queries(config, 20, bbox_degrees=15.0, query_days=2, seed=1)
+
+        # Assert
+        assert len(queries) == 20
+        assert all(-180 <= q.spatial.lon_min and q.spatial.lon_max <= 180 for q in queries)
+        assert all(config.start <= q.temporal.start for q in queries)
+        assert all(q.temporal.end.day <= config.start.day + config.days for q in queries)
+
+    def test_run_reports_latency_and_throughput(self):
+        """Test a small run completes with failures retried and metrics reported."""
+        # Arrange
+        config = SyntheticConfig(days=2, tile_degrees=45.0, shape=(16, 32), failure_rate=0.05)
+
+        # Act
+        report = run_load_test(queries=20, concurrency=4, config=config, seed=3)
+
+        # Assert
+        assert report.queries == 20
+        assert report.failures == 0
+        assert report.errors == {}
+        assert 0 < report.p50_latency <= report.p99_latency
+        assert report.bytes_downloaded > 0
+        assert report.queries_per_second > 0
+        assert report.peak_rss_mb is None or report.peak_rss_mb > 0
+
+    def test_registered_synthetic_plugin_left_alone(self, register):
+        """Test a run neither replaces nor unregisters the caller's synthetic plugin."""
+        # Arrange
+        mine = register(SyntheticPlugin("http://127.0.0.1:9"))
+        config = SyntheticConfig(days=1, tile_degrees=90.0, shape=(4, 8))
+
+        # Act
+        run_load_test(queries=2, concurrency=1, config=config)
+
+        # Assert
+        assert get_plugin("synthetic") is mine
+        assert not [name for name in available_plugins() if name.startswith("synthetic-loadtest")]
+
+    def test_failures_counted_by_type(self):
+        """Test failed queries are reported per exception type."""
+        # Arrange
+        config = SyntheticConfig(days=1, tile_degrees=90.0, shape=(4, 8), failure_rate=1.0)
+
+        # Act
+        report = run_load_test(queries=3, concurrency=1, config=config, max_workers=1)
+
+        # Assert
+        assert report.failures == 3
+        assert report.errors == {"ThrottledError": 3}
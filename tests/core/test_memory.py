@@ -0,0 +1,338 @@
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from rskit.core.executor import load
+from rskit.core.memory import MemoryBudget, SpillingStore
+from rskit.models.granule import Granule
+from rskit.models.query import Query, SpatialExtent, TemporalExtent
+from rskit.plugins.base import BasePlugin
+
+PIECE = np.arange(1000, dtype=np.float64).reshape(1, 10, 100)  # 8000 bytes
+
+
+class ArraySource(BasePlugin):
+    """Fake source whose granules decode to fixed-size arrays."""
+    name = "arrays"
+
+    def __init__(self, count=10):
+        self.granules = [
+            Granule(id=f"{i:02d}.npy", source=self.name, url=f"https://arrays.example.org/{i:02d}.npy", size=PIECE.nbytes)
+            for i in range(count)
+        ]
+
+    def discover(self, query):
+        return self.granules
+
+    def download(self, granule, dest_dir):
+        path = Path(dest_dir) / granule.id
+        np.save(path, PIECE + int(granule.id[:2]))
+        return path
+
+    def open(self, path, variable):
+        return np.load(path)
+
+
+@pytest.fixture
+def arrays(register):
+    return register(ArraySource())
+
+
+def _array_query(**options):
+    """Query on ``arrays`` with the given options."""
+    return Query(
+        variable="sst",
+        spatial=SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0),
+        temporal=TemporalExtent(start=datetime(2023, 1, 1), end=datetime(2023, 1, 2)),
+        sources=["arrays"],
+        options=options,
+    )
+
+
+class GriddedSource(ArraySource):
+    """ArraySource whose granules lie on a 0-10 degree lon/lat grid."""
+
+    def grid(self, path):
+        return np.linspace(0.0, 10.0, 100), np.linspace(0.0, 10.0, 10), "EPSG:4326"
+
+
+class UnsizedSource(ArraySource):
+    """ArraySource whose listings carry no sizes and whose downloads take a while."""
+
+    def __init__(self, count=6):
+        super().__init__(count)
+        for granule in self.granules:
+            granule.size = 0
+        self.active = 0
+        self.most_active = 0
+        self._lock = threading.Lock()
+
+    def download(self, granule, dest_dir):
+        with self._lock:
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        return super().download(granule, dest_dir)
+
+
+class TestMemoryBudget:
+    """Test cases for MemoryBudget."""
+
+    def test_reserve_blocks_until_release(self):
+        """Test a reservation waits while the budget is exhausted."""
+        # Arrange
+        budget = MemoryBudget(limit=100)
+        budget.reserve(80)
+        acquired = threading.Event()
+
+        def waiter():
+            budget.reserve(50)
+            acquired.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+
+        # Act
+        blocked = not acquired.wait(0.05)
+        budget.release(80)
+        thread.join(timeout=5)
+
+        # Assert
+        assert blocked
+        assert acquired.is_set()
+        assert budget.used == 50
+
+    def test_oversized_reservation_admitted_when_empty(self):
+        """Test a single item larger than the limit does not deadlock."""
+        # Arrange
+        budget = MemoryBudget(limit=100)
+
+        # Act
+        budget.reserve(500)
+
+        # Assert
+        assert budget.used == 500
+
+    def test_make_room_called_before_waiting(self):
+        """Test a reservation frees spillable memory instead of waiting for it."""
+        # Arrange
+        budget = MemoryBudget(limit=100)
+        budget.reserve(70)
+        spilled = []
+
+        def make_room(nbytes):
+            if spilled:
+                return False
+            spilled.append(70)
+            budget.release(70)
+            return True
+
+        # Act
+        budget.reserve(70, timeout=1, make_room=make_room)
+
+        # Assert
+        assert spilled == [70]
+        assert budget.used == 70
+
+    def test_reserve_timeout(self):
+        """Test a reservation gives up after its timeout."""
+        # Arrange
+        budget = MemoryBudget(limit=100)
+        budget.reserve(100)
+
+        # Act & Assert
+        with pytest.raises(TimeoutError):
+            budget.reserve(1, timeout=0.01)
+
+
+class TestSpillingStore:
+    """Test cases for SpillingStore."""
+
+    def test_spills_when_near_limit(self, tmp_path):
+        """Test pieces move to memory-mapped files past the high-water mark."""
+        # Arrange
+        budget = MemoryBudget(limit=3 * PIECE.nbytes, scratch_dir=tmp_path)
+        store = SpillingStore(budget)
+
+        # Act
+        for i in range(5):
+            store.add(str(i), PIECE + i)
+
+        # Assert
+        assert budget.used <= budget.high_water * budget.limit
+        assert any(tmp_path.iterdir())
+
+    def test_no_spill_when_in_flight_memory_blocks(self, tmp_path):
+        """Test make_room leaves pieces in memory when spilling cannot make room."""
+        # Arrange
+        budget = MemoryBudget(limit=200, scratch_dir=tmp_path)
+        store = SpillingStore(budget)
+        budget.reserve(140)
+        store.add("a", np.zeros(16, dtype=np.uint8))
+
+        # Act
+        reserved = budget.try_reserve(65, make_room=store.make_room)
+
+        # Assert
+        assert not reserved
+        assert store.resident_bytes == 16
+        assert not any(tmp_path.iterdir())
+
+    def test_merge_preserves_order_and_values(self, tmp_path):
+        """Test merging concatenates spilled and resident pieces in key order."""
+        # Arrange
+        budget = MemoryBudget(limit=2 * PIECE.nbytes, scratch_dir=tmp_path)
+        store = SpillingStore(budget)
+        for i in range(4):
+            store.add(str(i), PIECE + i)
+
+        # Act
+        merged = store.merge(["3", "0", "2", "1"])
+
+        # Assert
+        assert isinstance(merged, np.memmap)
+        np.testing.assert_array_equal(merged[:, 0, 0], [3, 0, 2, 1])
+
+    def test_merge_in_memory_without_limit(self):
+        """Test an unlimited budget merges into a regular array."""
+        # Arrange
+        store = SpillingStore(MemoryBudget())
+        store.add("a", PIECE)
+
+        # Act
+        merged = store.merge(["a"])
+
+        # Assert
+        assert not isinstance(merged, np.memmap)
+        assert merged.shape == PIECE.shape
+
+
+class TestLoad:
+    """Test cases for load with a memory limit."""
+
+    def test_memory_limit_bounds_peak_usage(self, arrays, tmp_path, monkeypatch):
+        """Test decoded data never exceeds the limit by more than one piece."""
+        # Arrange
+        limit = 3 * PIECE.nbytes
+        query = _array_query(memory_limit=limit, scratch_dir=str(tmp_path / "scratch"))
+        peaks = []
+        original = MemoryBudget.cleanup
+
+        def spy(self):
+            peaks.append(self.peak)
+            original(self)
+
+        monkeypatch.setattr(MemoryBudget, "cleanup", spy)
+
+        # Act
+        result = load(query, tmp_path)
+
+        # Assert
+        assert peaks[0] <= limit
+        np.testing.assert_array_equal(result["arrays"][:, 0, 0], np.arange(10))
+        assert not list((tmp_path / "scratch").glob("rskit-spill-*"))
+
+    def test_granules_larger_than_half_the_limit(self, register, tmp_path):
+        """Test granules of 0.7x the limit are loaded instead of waiting forever."""
+        # Arrange
+        plugin = register(ArraySource(count=3))
+        piece = np.arange(70, dtype=np.uint8).reshape(1, 70)
+        plugin.download = lambda granule, dest_dir: granule.id
+        plugin.open = lambda path, variable: piece + int(path[:2])
+        for granule in plugin.granules:
+            granule.size = piece.nbytes
+        query = _array_query(memory_limit=100, scratch_dir=str(tmp_path / "scratch"))
+        result = {}
+
+        # Act
+        thread = threading.Thread(target=lambda: result.update(load(query, tmp_path)), daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+
+        # Assert
+        assert not thread.is_alive()
+        np.testing.assert_array_equal(result["arrays"][:, 0], [0, 1, 2])
+
+    def test_unknown_sizes_estimated_from_decoded_pieces(self, register, tmp_path):
+        """Test granules listed with size 0 are still admitted against their decoded size."""
+        # Arrange
+        plugin = register(UnsizedSource())
+        query = _array_query(memory_limit=int(2.5 * PIECE.nbytes), scratch_dir=str(tmp_path / "scratch"))
+
+        # Act
+        result = load(query, tmp_path)
+
+        # Assert
+        assert plugin.most_active <= 2
+        assert result["arrays"].shape == (6, 10, 100)
+
+    def test_without_limit_returns_plain_array(self, arrays, tmp_path):
+        """Test load without a memory limit concatenates in memory."""
+        # Act
+        result = load(_array_query(), tmp_path)
+
+        # Assert
+        assert result["arrays"].shape == (10, 10, 100)
+        assert not isinstance(result["arrays"], np.memmap)
+
+    def test_invalid_memory_limit_rejected(self):
+        """Test a malformed memory_limit fails query validation."""
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            _array_query(memory_limit="lots")
+
+        assert "Invalid size 'lots'" in str(exc_info.value)
+
+    def test_memory_limit_types(self):
+        """Test a None memory_limit means no limit and other types fail validation."""
+        # Act
+        unlimited = _array_query(memory_limit=None)
+
+        # Assert
+        assert unlimited.options["memory_limit"] is None
+        with pytest.raises(ValidationError):
+            _array_query(memory_limit=[8, "GB"])
+
+    def test_projected_crs_resampled_to_resolution(self, register, tmp_path):
+        """Test granules are resampled onto the query CRS grid."""
+        # Arrange
+        register(GriddedSource(count=2))
+        spatial = SpatialExtent.from_bounds(2e5, 2e5, 8e5, 8e5, crs="EPSG:3857")
+        query = _array_query(resolution=1e5).model_copy(update={"spatial": spatial})
+
+        # Act
+        result = load(query, tmp_path)
+
+        # Assert
+        assert result["arrays"].shape == (2, 6, 6)
+        assert np.isfinite(result["arrays"]).all()
+        assert result["arrays"][1, 0, 0] == pytest.approx(result["arrays"][0, 0, 0] + 1)
+
+    def test_projected_crs_requires_resolution(self, arrays, tmp_path):
+        """Test loading into a projected CRS without a resolution fails early."""
+        # Arrange
+        query = _array_query().model_copy(update={"spatial": SpatialExtent.from_bounds(0, 0, 1e5, 1e5, crs="EPSG:3857")})
+
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            load(query, tmp_path)
+
+        assert "options['resolution'] is required" in str(exc_info.value)
+
+    def test_geographic_crs_alias_keeps_native_grid(self, arrays, tmp_path):
+        """Test a geographic CRS other than EPSG:4326 needs no resolution and is not resampled."""
+        # Arrange
+        spatial = SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0, crs="OGC:CRS84")
+        query = _array_query().model_copy(update={"spatial": spatial})
+
+        # Act
+        result = load(query, tmp_path)
+
+        # Assert
+        assert result["arrays"].shape == (10, 10, 100)
@@ -0,0 +1,349 @@
+import errno
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+
+import pytest
+from rskit.core.scheduler import AIMDController, DownloadScheduler, SharedDownloads, TokenBucket
+from rskit.models.granule import Granule
+from rskit.plugins.base import BasePlugin, RateLimit, ThrottledError
+
+
+class TestAIMDController:
+    """Test cases for AIMDController."""
+
+    def test_limit_grows_additively(self):
+        """Test the limit increases by one per window of successes."""
+        # Arrange
+        controller = AIMDController(initial=2, maximum=10)
+
+        # Act
+        for _ in range(2 + 3):
+            controller.record_success(1000, 1.0)
+
+        # Assert
+        assert controller.limit == 4
+
+    def test_limit_halves_on_failure(self):
+        """Test the limit decreases multiplicatively on errors."""
+        # Arrange
+        controller = AIMDController(initial=8, maximum=16)
+
+        # Act
+        controller.record_failure()
+
+        # Assert
+        assert controller.limit == 4
+
+    def test_limit_respects_bounds(self):
+        """Test the limit never leaves [minimum, maximum]."""
+        # Arrange
+        controller = AIMDController(initial=2, minimum=1, maximum=3)
+
+        # Act
+        for _ in range(50):
+            controller.record_success(1000, 1.0)
+        high = controller.limit
+        for _ in range(10):
+            controller.record_failure()
+
+        # Assert
+        assert high == 3
+        assert controller.limit == 1
+
+    def test_latency_spike_backs_off(self):
+        """Test slower transfers per byte are treated as congestion."""
+        # Arrange
+        controller = AIMDController(initial=8, maximum=16, smoothing=1.0)
+        controller.record_success(1000, 1.0)
+
+        # Act
+        controller.record_success(1000, 5.0)
+
+        # Assert
+        assert controller.limit == 4
+
+    def test_invalid_initial_raises(self):
+        """Test an initial limit outside the bounds is rejected."""
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            AIMDController(initial=0, minimum=1)
+
+        assert "initial (0) must be between" in str(exc_info.value)
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_wait(self):
+        """Test the bucket allows a burst then reports the wait time."""
+        # Arrange
+        now = [0.0]
+        bucket = TokenBucket(RateLimit(requests_per_second=2, burst=2), clock=lambda: now[0])
+
+        # Act
+        first, second, third = bucket.try_acquire(), bucket.try_acquire(), bucket.try_acquire()
+        now[0] = 0.5
+        fourth = bucket.try_acquire()
+
+        # Assert
+        assert first == second == 0.0
+        assert third == pytest.approx(0.5)
+        assert fourth == 0.0
+
+
+class TestDownloadScheduler:
+    """Test cases for DownloadScheduler."""
+
+    def test_runs_in_priority_then_size_order(self):
+        """Test queued tasks start by priority and then smallest size."""
+        # Arrange
+        order = []
+        gate = threading.Event()
+        with DownloadScheduler(max_workers=1) as scheduler:
+            scheduler.submit("h", gate.wait)
+            for name, size, priority in [("big", 300, 0), ("small", 10, 0), ("urgent", 999, -1)]:
+                scheduler.submit("h", lambda n=name: order.append(n), size=size, priority=priority)
+
+            # Act
+            gate.set()
+
+        # Assert
+        assert order == ["urgent", "small", "big"]
+
+    def test_host_concurrency_capped(self):
+        """Test a host never exceeds its declared max concurrency."""
+        # Arrange
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def transfer():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        # Act
+        with DownloadScheduler(max_workers=8) as scheduler:
+            futures = [scheduler.submit("h", transfer, max_concurrency=2) for _ in range(10)]
+
+        # Assert
+        assert all(f.done() for f in futures)
+        assert peak[0] <= 2
+
+    def test_saturated_host_does_not_block_other_hosts(self):
+        """Test tasks for a free host start while a saturated host has a backlog."""
+        # Arrange
+        gate = threading.Event()
+
+        # Act
+        with DownloadScheduler(max_workers=4) as scheduler:
+            busy = [scheduler.submit("a", lambda: gate.wait(5), max_concurrency=1) for _ in range(100)]
+            other = scheduler.submit("b", lambda: "done", priority=1)
+            result = other.result(timeout=5)
+            started = sum(f.running() or f.done() for f in busy)
+            gate.set()
+
+        # Assert
+        assert result == "done"
+        assert started == 1
+
+    def test_rate_limit_spaces_requests(self):
+        """Test a source rate limit is honoured across workers."""
+        # Arrange
+        starts = []
+        scheduler = DownloadScheduler(max_workers=4)
+        scheduler.set_rate_limit("slow", RateLimit(requests_per_second=20, burst=1))
+
+        # Act
+        for _ in range(5):
+            scheduler.submit("h", lambda: starts.append(time.monotonic()), source="slow")
+        scheduler.close()
+
+        # Assert
+        assert starts[-1] - starts[0] >= 4 / 20 * 0.9
+
+    def test_throttled_task_retried(self):
+        """Test throttled transfers are retried after retry_after and reduce the limit."""
+        # Arrange
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ThrottledError(retry_after=0.01)
+            return "ok"
+
+        # Act
+        with DownloadScheduler(max_workers=2) as scheduler:
+            future = scheduler.submit("h", flaky)
+            result = future.result(timeout=5)
+
+        # Assert
+        assert result == "ok"
+        assert len(calls) == 2
+
+    def test_exhausted_retries_set_exception(self):
+        """Test the future carries the error once retries run out."""
+        # Arrange
+        def broken():
+            raise ConnectionError("reset")
+
+        # Act
+        with DownloadScheduler(max_workers=1, max_retries=0) as scheduler:
+            future = scheduler.submit("h", broken)
+
+        # Assert
+        with pytest.raises(ConnectionError):
+            future.result()
+
+    def test_non_transient_error_fails_without_backoff(self):
+        """Test errors other than throttling or connection failures are not retried."""
+        # Arrange
+        calls = []
+
+        def invalid():
+            calls.append(1)
+            raise ValueError("corrupt granule")
+
+        # Act
+        with DownloadScheduler(max_workers=1, max_retries=3) as scheduler:
+            scheduler.submit("h", lambda: None).result(timeout=5)
+            limit = scheduler.controllers["h"].limit
+            future = scheduler.submit("h", invalid)
+            with pytest.raises(ValueError):
+                future.result(timeout=5)
+
+        # Assert
+        assert len(calls) == 1
+        assert scheduler.controllers["h"].limit == limit
+
+    @pytest.mark.parametrize("error", [
+        OSError(errno.ENOSPC, "No space left on device"),
+        HTTPError("https://h/a.nc", 404, "not found", {}, None),
+        URLError("unknown url type: foo"),
+    ], ids=["disk-full", "http-404", "bad-url"])
+    def test_local_and_permanent_errors_not_retried(self, error):
+        """Test a full disk or a permanent failure fails the transfer at once."""
+        # Arrange
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise error
+
+        # Act
+        with DownloadScheduler(max_workers=1, max_retries=3) as scheduler:
+            future = scheduler.submit("h", fail)
+            with pytest.raises(type(error)):
+                future.result(timeout=5)
+
+        # Assert
+        assert len(calls) == 1
+
+    def test_wrapped_connection_error_retried(self):
+        """Test a refused connection reported by urllib is retried."""
+        # Arrange
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise URLError(ConnectionRefusedError(errno.ECONNREFUSED, "refused"))
+            return "ok"
+
+        # Act
+        with DownloadScheduler(max_workers=1) as scheduler:
+            result = scheduler.submit("h", flaky).result(timeout=5)
+
+        # Assert
+        assert result == "ok"
+        assert len(calls) == 2
+
+    def test_submit_downloads_uses_plugin(self, tmp_path):
+        """Test plugin downloads are scheduled per granule."""
+        # Arrange
+        class Plugin(BasePlugin):
+            name = "fake"
+            rate_limit = RateLimit(requests_per_second=100, burst=10, max_concurrency=2)
+
+            def discover(self, query):
+                return []
+
+            def download(self, granule, dest_dir):
+                return Path(dest_dir) / granule.id
+
+        granules = [Granule(id=f"g{i}.nc", source="fake", url=f"https://data.example.org/g{i}.nc") for i in range(3)]
+
+        # Act
+        with DownloadScheduler(max_workers=2) as scheduler:
+            futures = scheduler.submit_downloads(Plugin(), granules, tmp_path)
+
+        # Assert
+        assert {k: f.result() for k, f in futures.items()} == {g.key: tmp_path / g.id for g in granules}
+        assert "data.example.org" in scheduler.controllers
+
+
+class GatedPlugin(BasePlugin):
+    """Fake plugin whose downloads block until ``gate`` is set."""
+    name = "gated"
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.downloads = []
+
+    def discover(self, query):
+        return []
+
+    def download(self, granule, dest_dir):
+        self.gate.wait(5)
+        self.downloads.append(granule.id)
+        return Path(dest_dir) / granule.id
+
+
+class TestSharedDownloads:
+    """Test cases for SharedDownloads."""
+
+    def test_concurrent_callers_share_a_download(self, tmp_path):
+        """Test a granule requested twice while in flight is downloaded once."""
+        # Arrange
+        plugin = GatedPlugin()
+        granule = Granule(id="a.nc", source="gated", url="https://data.example.org/a.nc")
+
+        # Act
+        with DownloadScheduler(max_workers=2) as scheduler:
+            downloads = SharedDownloads(scheduler)
+            first = downloads.submit(plugin, [granule], tmp_path)
+            second = downloads.submit(plugin, [granule], tmp_path)
+            plugin.gate.set()
+
+        # Assert
+        assert first[granule.key] is second[granule.key]
+        assert plugin.downloads == ["a.nc"]
+        assert len(downloads) == 0
+
+    def test_cancelled_only_when_every_caller_releases(self, tmp_path):
+        """Test a queued download survives one caller giving up and is cancelled by the last."""
+        # Arrange
+        plugin = GatedPlugin()
+        busy, queued = (Granule(id=f"{n}.nc", source="gated", url=f"https://data.example.org/{n}.nc") for n in "ab")
+
+        with DownloadScheduler(max_workers=1) as scheduler:
+            downloads = SharedDownloads(scheduler)
+            downloads.submit(plugin, [busy], tmp_path)
+            first = downloads.submit(plugin, [queued], tmp_path)
+            second = downloads.submit(plugin, [queued], tmp_path)
+
+            # Act
+            downloads.release(first)
+            kept = not first[queued.key].cancelled()
+            downloads.release(second)
+            plugin.gate.set()
+
+        # Assert
+        assert kept
+        assert second[queued.key].cancelled()
+        assert plugin.downloads == ["a.nc"]
@@ -0,0 +1,258 @@
+import errno
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from rskit.core.cache import ListingCache
+from rskit.core.server import QueryClient, QueryService, create_server
+from rskit.models.granule import Granule
+from rskit.models.query import Query, SpatialExtent, TemporalExtent
+from rskit.plugins.base import BasePlugin
+
+
+class CountingSource(BasePlugin):
+    """Fake source counting listings and downloads."""
+    name = "counting"
+
+    def __init__(self):
+        self.listings = 0
+        self.downloads = 0
+        self.gate = None
+
+    def discover(self, query):
+        self.listings += 1
+        return [Granule(id="a.nc", source=self.name, url="https://counting.example.org/a.nc")]
+
+    def download(self, granule, dest_dir):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.downloads += 1
+        path = Path(dest_dir) / granule.id
+        path.write_bytes(b"data")
+        return path
+
+
+class BrokenSource(CountingSource):
+    """Fake source whose listing fails with an internal error."""
+    name = "broken"
+
+    def discover(self, query):
+        raise ValueError("malformed catalog response")
+
+
+def _query(*sources, **fields):
+    """Small one-day query for the given sources."""
+    return Query(
+        variable="sst",
+        spatial=SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0),
+        temporal=TemporalExtent(start=datetime(2023, 1, 1), end=datetime(2023, 1, 2)),
+        sources=list(sources),
+        **fields,
+    )
+
+
+@pytest.fixture
+def source(register):
+    return register(CountingSource())
+
+
+@pytest.fixture(params=["http", "unix"])
+def daemon(request, source, tmp_path):
+    service = QueryService(tmp_path / "data", max_workers=2)
+    if request.param == "unix":
+        socket_path = str(tmp_path / "rskit.sock")
+        server = create_server(service, socket_path=socket_path)
+        address = f"unix://{socket_path}"
+    else:
+        server = create_server(service, port=0)
+        address = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield QueryClient(address, timeout=10), service
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+class TestQueryDaemon:
+    """Test cases for the rskit serve daemon."""
+
+    def test_query_returns_paths(self, daemon, source, tmp_path):
+        """Test a query sent over RPC returns downloaded file paths."""
+        # Arrange
+        client, _ = daemon
+
+        # Act
+        files = client.execute(_query("counting"))
+
+        # Assert
+        assert files == {"counting": [tmp_path / "data" / "a.nc"]}
+        assert files["counting"][0].read_bytes() == b"data"
+
+    def test_listing_cache_warm_across_requests(self, daemon, source):
+        """Test repeated queries reuse the daemon's listing cache."""
+        # Arrange
+        client, _ = daemon
+
+        # Act
+        client.execute(_query("counting"))
+        client.execute(_query("counting"))
+
+        # Assert
+        assert source.listings == 1
+        assert client.health()["cached_listings"] == 1
+
+    def test_health_reports_plugins(self, daemon, source):
+        """Test the health endpoint lists registered plugins."""
+        # Arrange
+        client, _ = daemon
+
+        # Act
+        health = client.health()
+
+        # Assert
+        assert health["status"] == "ok"
+        assert "counting" in health["plugins"]
+
+    def test_concurrent_requests_share_downloads(self, daemon, source):
+        """Test clients asking for the same granule at once trigger one download."""
+        # Arrange
+        client, _ = daemon
+        source.gate = threading.Event()
+        results = []
+
+        def send():
+            results.append(client.execute(_query("counting")))
+
+        threads = [threading.Thread(target=send) for _ in range(4)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        while source.listings == 0:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        source.gate.set()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert len(results) == 4
+        assert source.downloads == 1
+
+    def test_unknown_source_is_client_error(self, daemon, source):
+        """Test errors in the query surface as ValueError on the client."""
+        # Arrange
+        client, _ = daemon
+
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            client.execute(_query("nowhere"))
+
+        assert "Unknown data source 'nowhere'" in str(exc_info.value)
+
+
+    def test_internal_value_error_is_server_error(self, daemon, register):
+        """Test a ValueError raised while serving a valid query is not blamed on the client."""
+        # Arrange
+        client, _ = daemon
+        register(BrokenSource())
+
+        # Act & Assert
+        with pytest.raises(RuntimeError) as exc_info:
+            client.execute(_query("broken"))
+
+        assert "malformed catalog response" in str(exc_info.value)
+
+
+class TestUnixSocketPath:
+    """Test cases for binding the daemon to an existing socket path."""
+
+    def test_stale_socket_replaced(self, tmp_path):
+        """Test a socket left behind by a dead daemon is removed."""
+        # Arrange
+        path = str(tmp_path / "rskit.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        service = QueryService(tmp_path / "data", max_workers=1)
+
+        # Act
+        server = create_server(service, socket_path=path)
+
+        # Assert
+        server.server_close()
+        service.close()
+
+    def test_live_socket_refused(self, tmp_path):
+        """Test a socket another daemon is listening on is left alone."""
+        # Arrange
+        path = str(tmp_path / "rskit.sock")
+        live = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        live.bind(path)
+        live.listen(1)
+        service = QueryService(tmp_path / "data", max_workers=1)
+
+        # Act & Assert
+        try:
+            with pytest.raises(OSError) as exc_info:
+                create_server(service, socket_path=path)
+        finally:
+            live.close()
+            service.close()
+
+        assert exc_info.value.errno == errno.EADDRINUSE
+        assert os.path.exists(path)
+
+    def test_regular_file_refused(self, tmp_path):
+        """Test a path holding a regular file is never unlinked."""
+        # Arrange
+        path = tmp_path / "rskit.sock"
+        path.write_text("not a socket")
+        service = QueryService(tmp_path / "data", max_workers=1)
+
+        # Act & Assert
+        try:
+            with pytest.raises(FileExistsError):
+                create_server(service, socket_path=str(path))
+        finally:
+            service.close()
+
+        assert path.read_text() == "not a socket"
+
+
+class TestListingCache:
+    """Test cases for ListingCache."""
+
+    def test_entries_expire(self):
+        """Test entries older than the TTL are dropped."""
+        # Arrange
+        now = [0.0]
+        cache = ListingCache(ttl=10, clock=lambda: now[0])
+        query = _query("counting")
+        cache.put("counting", query, [])
+
+        # Act
+        fresh = cache.get("counting", query)
+        now[0] = 11.0
+        stale = cache.get("counting", query)
+
+        # Assert
+        assert fresh == []
+        assert stale is None
+
+    def test_key_ignores_sources_and_options(self):
+        """Test listings are shared between queries differing only in sources or options."""
+        # Arrange
+        cache = ListingCache()
+        cache.put("counting", _query("counting"), [])
+
+        # Act
+        hit = cache.get("counting", _query("counting", "other", options={"format": "netcdf"}))
+
+        # Assert
+        assert hit == []
@@ -138,10 +138,10 @@ class TestSpatialExtent:
         assert "greater than or equal to -180" in str(exc_info.value)
 
     def test_spatial_extent_lon_max_above_maximum(self):
-        """Test SpatialExtent with longitude maximum above 180."""
+        """Test SpatialExtent with longitude maximum above 360."""
         # Arrange
         lon_min = 0.0
-        lon_max = 181.0
+        lon_max = 361.0
         lat_min, lat_max = 0.0, 10.0
         
         # Act & Assert
@@ -153,7 +153,7 @@ class TestSpatialExtent:
                 lat_max=lat_max
             )
         
-        assert "less than or equal to 180" in str(exc_info.value)
+        assert "less than or equal to 360" in str(exc_info.value)
 
     def test_spatial_extent_lat_min_below_minimum(self):
         """Test SpatialExtent with latitude minimum below -90."""
@@ -192,22 +192,110 @@ class TestSpatialExtent:
         assert "less than or equal to 90" in str(exc_info.value)
 
     def test_spatial_extent_lon_max_less_than_lon_min(self):
-        """Test SpatialExtent with lon_max less than lon_min."""
+        """Test SpatialExtent with lon_max less than lon_min crosses the antimeridian."""
         # Arrange
-        lon_min = 10.0
-        lon_max = 5.0
+        lon_min = 170.0
+        lon_max = -170.0
+        lat_min, lat_max = 0.0, 10.0
+        
+        # Act
+        spatial = SpatialExtent(
+            lon_min=lon_min,
+            lon_max=lon_max,
+            lat_min=lat_min,
+            lat_max=lat_max
+        )
+        
+        # Assert
+        assert spatial.crosses_antimeridian
+        assert (spatial.lon_min, spatial.lon_max) == (170.0, -170.0)
+
+    def test_spatial_extent_0_360_longitudes_normalized(self):
+        """Test SpatialExtent maps 0..360 longitudes to -180..180."""
+        # Arrange
+        lon_min = 170.0
+        lon_max = 190.0
+        lat_min, lat_max = 0.0, 10.0
+        
+        # Act
+        spatial = SpatialExtent(
+            lon_min=lon_min,
+            lon_max=lon_max,
+            lat_min=lat_min,
+            lat_max=lat_max
+        )
+        
+        # Assert
+        assert (spatial.lon_min, spatial.lon_max) == (170.0, -170.0)
+        assert spatial.crosses_antimeridian
+
+    def test_spatial_extent_0_360_prime_meridian_crossing(self):
+        """Test a 0..360 box wrapping past 360 becomes a plain box over 0 degrees."""
+        # Arrange
+        lon_min = 350.0
+        lon_max = 10.0
         lat_min, lat_max = 0.0, 10.0
         
+        # Act
+        spatial = SpatialExtent(
+            lon_min=lon_min,
+            lon_max=lon_max,
+            lat_min=lat_min,
+            lat_max=lat_max
+        )
+        
+        # Assert
+        assert (spatial.lon_min, spatial.lon_max) == (-10.0, 10.0)
+        assert not spatial.crosses_antimeridian
+
+    def test_spatial_extent_0_360_full_globe(self):
+        """Test a 0..360 box spanning the globe becomes -180..180."""
+        # Act
+        spatial = SpatialExtent(lon_min=0.0, lon_max=360.0, lat_min=-90.0, lat_max=90.0)
+        
+        # Assert
+        assert (spatial.lon_min, spatial.lon_max) == (-180.0, 180.0)
+
+    def test_spatial_extent_split_antimeridian(self):
+        """Test split returns the two halves of a dateline-crossing box."""
+        # Arrange
+        spatial = SpatialExtent(lon_min=160.0, lon_max=-150.0, lat_min=-10.0, lat_max=10.0)
+        
+        # Act
+        boxes = spatial.split()
+        
+        # Assert
+        assert [(b.lon_min, b.lon_max) for b in boxes] == [(160.0, 180.0), (-180.0, -150.0)]
+        assert all(b.lat_min == -10.0 and b.lat_max == 10.0 for b in boxes)
+
+    def test_spatial_extent_split_plain_box(self):
+        """Test split returns a non-crossing box unchanged."""
+        # Arrange
+        spatial = SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0)
+        
+        # Act & Assert
+        assert spatial.split() == [spatial]
+
+    @pytest.mark.parametrize("crs, expected", [
+        ("epsg:4326", "EPSG:4326"),
+        ("EPSG:3413", "EPSG:3413"),
+        ("OGC:CRS84", "OGC:CRS84"),
+    ])
+    def test_spatial_extent_crs_normalized(self, crs, expected):
+        """Test CRS identifiers are validated and normalised."""
+        # Act
+        spatial = SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0, crs=crs)
+
+        # Assert
+        assert spatial.crs == expected
+
+    def test_spatial_extent_invalid_crs(self):
+        """Test an unknown CRS is rejected at validation time."""
         # Act & Assert
         with pytest.raises(ValidationError) as exc_info:
-            SpatialExtent(
-                lon_min=lon_min,
-                lon_max=lon_max,
-                lat_min=lat_min,
-                lat_max=lat_max
-            )
-        
-        assert "lon_max (5.0) must be >= lon_min (10.0)" in str(exc_info.value)
+            SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0, crs="not-a-crs")
+
+        assert "Invalid CRS 'not-a-crs'" in str(exc_info.value)
 
     def test_spatial_extent_lon_max_equal_to_lon_min(self):
         """Test SpatialExtent with lon_max equal to lon_min."""
@@ -632,10 +720,10 @@ class TestQuery:
         
         # Act & Assert
         with pytest.raises(ValidationError) as exc_info:
-            # Invalid spatial extent with lon_max < lon_min
+            # Invalid spatial extent with lat_max < lat_min
             spatial = SpatialExtent(
-                lon_min=10.0, lon_max=5.0,
-                lat_min=0.0, lat_max=10.0
+                lon_min=0.0, lon_max=10.0,
+                lat_min=10.0, lat_max=5.0
             )
             Query(
                 variable=variable,
@@ -644,7 +732,7 @@ class TestQuery:
                 sources=sources
             )
         
-        assert "lon_max (5.0) must be >= lon_min (10.0)" in str(exc_info.value)
+        assert "lat_max (5.0) must be > lat_min (10.0)" in str(exc_info.value)
 
     def test_query_invalid_temporal_extent_propagates_error(self):
         """Test Query with invalid temporal extent propagates ValidationError."""
@@ -0,0 +1,182 @@
+from datetime import datetime, timezone
+from urllib.error import HTTPError
+
+import pytest
+from rskit.auth import CredentialManager
+from rskit.models.query import Query, SpatialExtent, TemporalExtent
+from rskit.plugins.base import ThrottledError
+from rskit.plugins.synthetic import (
+    SyntheticConfig,
+    SyntheticPlugin,
+    SyntheticServer,
+    SyntheticServerProcess,
+    synthetic_catalog,
+    write_granule,
+)
+
+CONFIG = SyntheticConfig(days=3, tile_degrees=90.0, shape=(8, 16))
+
+
+@pytest.fixture
+def server():
+    with SyntheticServer(CONFIG) as running:
+        yield running
+
+
+def _query(lon_min=10.0, lon_max=20.0, day=2):
+    return Query(
+        variable=CONFIG.variable,
+        spatial=SpatialExtent(lon_min=lon_min, lon_max=lon_max, lat_min=10.0, lat_max=20.0),
+        temporal=TemporalExtent(start=datetime(2023, 1, day, 6), end=datetime(2023, 1, day, 18)),
+        sources=["synthetic"],
+    )
+
+
+class TestSyntheticPlugin:
+    """Test cases for SyntheticPlugin and SyntheticServer."""
+
+    def test_catalog_covers_days_and_tiles(self, server):
+        """Test the catalog has one granule per day and tile."""
+        # Assert
+        assert len(server.catalog) == 3 * 2 * 4
+
+    def test_discover_filters_space_and_time(self, server):
+        """Test discovery returns only the intersecting tile for the query day."""
+        # Arrange
+        plugin = SyntheticPlugin(server.url)
+
+        # Act
+        granules = plugin.discover(_query())
+
+        # Assert
+        assert [g.id for g in granules] == ["20230102_+0000.0_+000.0.nc"]
+
+    def test_discover_timezone_aware_query(self, server):
+        """Test aware query times are compared with the naive catalog as UTC."""
+        # Arrange
+        plugin = SyntheticPlugin(server.url)
+        query = _query().model_copy(update={"temporal": TemporalExtent(
+            start=datetime(2023, 1, 2, 6, tzinfo=timezone.utc), end=datetime(2023, 1, 2, 18, tzinfo=timezone.utc),
+        )})
+
+        # Act
+        granules = plugin.discover(query)
+
+        # Assert
+        assert [g.id for g in granules] == ["20230102_+0000.0_+000.0.nc"]
+
+    def test_download_and_open_netcdf(self, server, tmp_path):
+        """Test a granule is served as NetCDF and decodes to the configured grid."""
+        # Arrange
+        plugin = SyntheticPlugin(server.url)
+        granule = plugin.discover(_query())[0]
+
+        # Act
+        path = plugin.download(granule, tmp_path)
+        data = plugin.open(path, CONFIG.variable)
+
+        # Assert
+        assert data.shape == (1, 8, 16)
+        assert plugin.bytes_downloaded == path.stat().st_size
+
+    def test_timezone_aware_archive_start(self, tmp_path):
+        """Test granules of an archive starting at an aware datetime get UTC epoch times."""
+        # Arrange
+        config = CONFIG.model_copy(update={"start": datetime(2023, 1, 1, tzinfo=timezone.utc)})
+        granule = synthetic_catalog(config, "http://127.0.0.1")[0]
+        path = tmp_path / granule.id
+
+        # Act
+        write_granule(path, config, granule)
+
+        # Assert
+        times = SyntheticPlugin("http://127.0.0.1").open(path, "time")
+        assert times[0] == datetime(2023, 1, 1, tzinfo=timezone.utc).timestamp()
+
+    def test_existing_file_not_downloaded_again(self, server, tmp_path):
+        """Test downloads are skipped when the file is already present."""
+        # Arrange
+        plugin = SyntheticPlugin(server.url)
+        granule = plugin.discover(_query())[0]
+        plugin.download(granule, tmp_path)
+        requests = server.requests
+
+        # Act
+        plugin.download(granule, tmp_path)
+
+        # Assert
+        assert server.requests == requests
+
+    def test_injected_failures_raise_throttled(self, tmp_path):
+        """Test HTTP 503 from the server surfaces as ThrottledError."""
+        # Arrange
+        config = CONFIG.model_copy(update={"failure_rate": 1.0})
+        with SyntheticServer(config) as failing:
+            plugin = SyntheticPlugin(failing.url)
+
+            # Act & Assert
+            with pytest.raises(ThrottledError) as exc_info:
+                plugin.discover(_query())
+
+        assert exc_info.value.retry_after == 0.0
+        assert failing.failures == 5
+
+    def test_credentials_sent_to_protected_server(self, tmp_path, monkeypatch):
+        """Test the plugin logs in with the shared credential manager's netrc entry."""
+        # Arrange
+        config = CONFIG.model_copy(update={"username": "alice", "password": "s3cret"})
+        netrc_file = tmp_path / "netrc"
+        netrc_file.write_text("machine 127.0.0.1 login alice password s3cret\n")
+        monkeypatch.setattr("rskit.plugins.base.get_credential_manager", lambda: CredentialManager(netrc_path=netrc_file))
+
+        with SyntheticServer(config) as protected:
+            plugin = SyntheticPlugin(protected.url)
+
+            # Act
+            path = plugin.download(plugin.discover(_query())[0], tmp_path)
+
+        # Assert
+        assert path.exists()
+
+    def test_protected_server_rejects_anonymous_requests(self, tmp_path, monkeypatch):
+        """Test requests without credentials are refused by a protected server."""
+        # Arrange
+        config = CONFIG.model_copy(update={"username": "alice", "password": "s3cret"})
+        monkeypatch.setattr(
+            "rskit.plugins.base.get_credential_manager", lambda: CredentialManager(netrc_path=tmp_path / "absent"),
+        )
+
+        with SyntheticServer(config) as protected:
+            plugin = SyntheticPlugin(protected.url)
+
+            # Act & Assert
+            with pytest.raises(HTTPError) as exc_info:
+                plugin.discover(_query())
+
+        assert exc_info.value.code == 401
+
+    def test_injected_latency(self):
+        """Test every response is delayed by the configured latency."""
+        # Arrange
+        config = CONFIG.model_copy(update={"latency": 0.05})
+        with SyntheticServer(config) as slow:
+            plugin = SyntheticPlugin(slow.url)
+            started = datetime.now()
+
+            # Act
+            plugin.discover(_query())
+
+            # Assert
+            assert (datetime.now() - started).total_seconds() >= 0.05
+
+    def test_server_process_serves_and_reports_stats(self, tmp_path):
+        """Test the out-of-process server answers requests and counts them."""
+        # Arrange & Act
+        with SyntheticServerProcess(CONFIG) as running:
+            plugin = SyntheticPlugin(running.url)
+            path = plugin.download(plugin.discover(_query())[0], tmp_path)
+            stats = running.stats()
+
+        # Assert
+        assert path.exists()
+        assert stats == {"requests": 2, "failures": 0}
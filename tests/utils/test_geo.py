@@ -0,0 +1,90 @@
+import numpy as np
+from rskit.models.granule import Granule
+from rskit.models.query import SpatialExtent
+from rskit.utils.geo import FootprintIndex, bbox_intersects
+
+
+def _granule(name, lon_min, lon_max, lat_min=-5.0, lat_max=5.0):
+    spatial = SpatialExtent(lon_min=lon_min, lon_max=lon_max, lat_min=lat_min, lat_max=lat_max)
+    return Granule(id=name, source="test", url=f"file:///{name}", spatial=spatial)
+
+
+class TestBboxIntersects:
+    """Test cases for bbox_intersects."""
+
+    def test_plain_boxes_fast_path(self):
+        """Test overlap of non-wrapping boxes."""
+        # Arrange
+        extent = SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0)
+
+        # Act
+        mask = bbox_intersects(
+            extent,
+            np.array([5.0, 20.0, -10.0]),
+            np.array([15.0, 30.0, 0.0]),
+            np.array([0.0, 0.0, 20.0]),
+            np.array([5.0, 5.0, 30.0]),
+        )
+
+        # Assert
+        assert mask.tolist() == [True, False, False]
+
+    def test_query_crossing_antimeridian(self):
+        """Test footprints on either side of the dateline match a crossing query."""
+        # Arrange
+        extent = SpatialExtent(lon_min=170.0, lon_max=-170.0, lat_min=-10.0, lat_max=10.0)
+
+        # Act
+        mask = bbox_intersects(
+            extent,
+            np.array([175.0, -179.0, 0.0]),
+            np.array([179.0, -175.0, 10.0]),
+            np.full(3, -1.0),
+            np.full(3, 1.0),
+        )
+
+        # Assert
+        assert mask.tolist() == [True, True, False]
+
+    def test_footprint_crossing_antimeridian(self):
+        """Test a wrapping footprint matches plain queries on both sides."""
+        # Arrange
+        east = SpatialExtent(lon_min=175.0, lon_max=178.0, lat_min=-1.0, lat_max=1.0)
+        west = SpatialExtent(lon_min=-178.0, lon_max=-175.0, lat_min=-1.0, lat_max=1.0)
+        away = SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=-1.0, lat_max=1.0)
+        footprint = (np.array([170.0]), np.array([-170.0]), np.array([-5.0]), np.array([5.0]))
+
+        # Act & Assert
+        assert bbox_intersects(east, *footprint).tolist() == [True]
+        assert bbox_intersects(west, *footprint).tolist() == [True]
+        assert bbox_intersects(away, *footprint).tolist() == [False]
+
+
+class TestFootprintIndex:
+    """Test cases for FootprintIndex."""
+
+    def test_query_keeps_granules_without_footprint(self):
+        """Test granules lacking a footprint are never filtered out."""
+        # Arrange
+        granules = [
+            _granule("pacific", 175.0, -175.0),
+            _granule("atlantic", -40.0, -30.0),
+            Granule(id="global", source="test", url="file:///global"),
+        ]
+        index = FootprintIndex(granules)
+        extent = SpatialExtent(lon_min=170.0, lon_max=190.0, lat_min=-10.0, lat_max=10.0)
+
+        # Act
+        result = index.query(extent)
+
+        # Assert
+        assert [g.id for g in result] == ["pacific", "global"]
+
+    def test_empty_index(self):
+        """Test an empty index returns no granules."""
+        # Arrange
+        index = FootprintIndex([])
+        extent = SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0)
+
+        # Act & Assert
+        assert index.query(extent) == []
@@ -0,0 +1,152 @@
+import numpy as np
+import pytest
+from rskit.models.query import SpatialExtent
+from rskit.utils import reproject
+from rskit.utils.reproject import get_resampling_weights, get_transformer, grid_axes, resample, transform_bounds
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    reproject.clear_caches()
+    yield
+    reproject.clear_caches()
+
+
+class TestTransformerCache:
+    """Test cases for cached transformers and bounds reprojection."""
+
+    def test_transformer_reused(self):
+        """Test the same transformer object is returned for a CRS pair."""
+        # Act
+        first = get_transformer("EPSG:4326", "EPSG:3413")
+        second = get_transformer("EPSG:4326", "EPSG:3413")
+
+        # Assert
+        assert first is second
+
+    def test_polar_box_reaches_pole(self):
+        """Test a polar stereographic box around the pole covers all longitudes up to 90N."""
+        # Act
+        spatial = SpatialExtent.from_bounds(-1e6, -1e6, 1e6, 1e6, crs="EPSG:3413")
+
+        # Assert
+        assert (spatial.lon_min, spatial.lon_max) == (-180.0, 180.0)
+        assert spatial.lat_max == pytest.approx(90.0)
+        assert 75.0 < spatial.lat_min < 80.0
+        assert spatial.crs == "EPSG:3413"
+
+    def test_projected_box_kept_for_output_grid(self):
+        """Test the box given in a projected CRS defines the output grid, not its geographic envelope."""
+        # Arrange
+        spatial = SpatialExtent.from_bounds(-1e6, -1e6, 1e6, 1e6, crs="EPSG:3413")
+
+        # Act
+        x, y = grid_axes(spatial.bounds(), 25000.0)
+
+        # Assert
+        assert spatial.bounds() == (-1e6, -1e6, 1e6, 1e6)
+        assert (y.size, x.size) == (80, 80)
+
+    def test_utm_box_densified(self):
+        """Test densified edges enclose the curved UTM box."""
+        # Arrange
+        bounds = (200000.0, 4000000.0, 800000.0, 5000000.0)
+
+        # Act
+        sparse = transform_bounds(bounds, "EPSG:32633", "EPSG:4326", densify=2)
+        dense = transform_bounds(bounds, "EPSG:32633", "EPSG:4326", densify=21)
+
+        # Assert
+        assert dense[0] <= sparse[0] and dense[2] >= sparse[2]
+        assert dense[3] >= sparse[3]
+
+    def test_geographic_bounds_fast_path(self):
+        """Test bounds in EPSG:4326 are returned without reprojection."""
+        # Arrange
+        spatial = SpatialExtent(lon_min=0.0, lon_max=10.0, lat_min=0.0, lat_max=10.0)
+
+        # Act & Assert
+        assert spatial.bounds() == (0.0, 0.0, 10.0, 10.0)
+
+
+class TestResampling:
+    """Test cases for cached resampling weights."""
+
+    def test_weights_cached_per_grid(self):
+        """Test weights are computed once per pair of grids."""
+        # Arrange
+        src_x, src_y = np.arange(0.0, 10.0), np.arange(0.0, 5.0)
+        dst_x, dst_y = np.array([0.5, 2.5]), np.array([1.5])
+
+        # Act
+        first = get_resampling_weights(src_x, src_y, "EPSG:4326", dst_x, dst_y, "EPSG:4326")
+        second = get_resampling_weights(src_x.copy(), src_y.copy(), "EPSG:4326", dst_x, dst_y, "EPSG:4326")
+
+        # Assert
+        assert first is second
+
+    def test_bilinear_reproduces_linear_field(self):
+        """Test bilinear weights are exact for a linear field, with a descending y axis."""
+        # Arrange
+        src_x = np.arange(-10.0, 11.0)
+        src_y = np.arange(10.0, -11.0, -1.0)
+        data = src_x[None, :] * 2 + src_y[:, None]
+        dst_x, dst_y = np.array([-2.5, 0.25, 7.75]), np.array([3.5, -4.25])
+
+        # Act
+        out = resample(data, src_x, src_y, "EPSG:4326", dst_x, dst_y, "EPSG:4326")
+
+        # Assert
+        np.testing.assert_allclose(out, dst_x[None, :] * 2 + dst_y[:, None])
+
+    def test_0_360_source_and_outside_points(self):
+        """Test target longitudes are wrapped into a 0..360 source grid and NaN outside."""
+        # Arrange
+        src_x, src_y = np.arange(0.0, 360.0, 1.0), np.arange(-10.0, 11.0)
+        data = np.broadcast_to(src_x, (src_y.size, src_x.size))
+        dst_x, dst_y = np.array([-90.0, 45.0]), np.array([0.0, 20.0])
+
+        # Act
+        out = resample(data, src_x, src_y, "EPSG:4326", dst_x, dst_y, "EPSG:4326", method="nearest")
+
+        # Assert
+        np.testing.assert_allclose(out[0], [270.0, 45.0])
+        assert np.isnan(out[1]).all()
+
+    def test_projected_target_with_leading_dims(self):
+        """Test resampling a time stack onto a polar stereographic grid."""
+        # Arrange
+        src_x, src_y = np.arange(-180.0, 180.0, 1.0), np.arange(60.0, 90.5, 0.5)
+        stack = np.stack([np.ones((src_y.size, src_x.size)) * t for t in range(3)])
+        dst_x = dst_y = np.linspace(-1e6, 1e6, 5)
+
+        # Act
+        out = resample(stack, src_x, src_y, "EPSG:4326", dst_x, dst_y, "EPSG:3413")
+
+        # Assert
+        assert out.shape == (3, 5, 5)
+        np.testing.assert_allclose(out[:, 2, 2], [0.0, 1.0, 2.0])
+
+    def test_geographic_resample_without_pyproj(self, monkeypatch):
+        """Test EPSG:4326 to EPSG:4326 resampling never imports pyproj."""
+        # Arrange
+        def missing():
+            raise ImportError("no pyproj")
+
+        monkeypatch.setattr(reproject, "_pyproj", missing)
+        src_x, src_y = np.arange(0.0, 10.0), np.arange(0.0, 5.0)
+        data = src_x[None, :] + 10 * src_y[:, None]
+
+        # Act
+        out = resample(data, src_x, src_y, "EPSG:4326", [2.5], [1.5], "EPSG:4326")
+
+        # Assert
+        np.testing.assert_allclose(out, [[17.5]])
+
+    def test_unknown_method_raises(self):
+        """Test an unsupported resampling method is rejected."""
+        # Act & Assert
+        with pytest.raises(ValueError) as exc_info:
+            get_resampling_weights([0.0, 1.0], [0.0, 1.0], "EPSG:4326", [0.5], [0.5], "EPSG:4326", method="cubic")
+
+        assert "Unknown resampling method 'cubic'" in str(exc_info.value)
@@ -0,0 +1,25 @@
+import pytest
+from rskit.utils.units import parse_size
+
+
+class TestParseSize:
+    """Test cases for parse_size."""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("8GB", 8 * 10**9),
+        ("512 MiB", 512 * 2**20),
+        ("1.5kb", 1500),
+        ("1024", 1024),
+        (4096, 4096),
+    ])
+    def test_valid_sizes(self, value, expected):
+        """Test decimal, binary and bare sizes are parsed."""
+        # Act & Assert
+        assert parse_size(value) == expected
+
+    @pytest.mark.parametrize("value", ["eight gigs", "8XB", "", 0, -5, True, None, [8], {"GB": 8}])
+    def test_invalid_sizes(self, value):
+        """Test malformed or non-positive sizes are rejected."""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            parse_size(value)